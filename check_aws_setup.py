@@ -1,62 +1,136 @@
 # AWS Setup Checker & Fixer
 # This will diagnose your AWS configuration and tell you exactly what to fix
 
-import boto3
+import functools
+from io import StringIO
+from itertools import islice
 import os
+import sys
 from dotenv import load_dotenv
-import json
+from src.utils.llm_helpers import invoke_model_json, json_dumps
+
+# Load environment once and snapshot the settings the checks read
+load_dotenv()
+_ENV = {
+    'AWS_ACCESS_KEY_ID': os.getenv('AWS_ACCESS_KEY_ID'),
+    'AWS_SECRET_ACCESS_KEY': os.getenv('AWS_SECRET_ACCESS_KEY'),
+    'AWS_REGION': os.getenv('AWS_REGION', 'us-east-1'),
+    # Newer Claude models need an inference profile id such as us.anthropic.claude-...
+    'BEDROCK_MODEL_ID': os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0'),
+}
+
+# Simple test prompt, encoded once since it never changes
+_TEST_PROMPT = """You are a movie and cocktail expert. 
+
+Recommend one cocktail for the movie "Casablanca". 
+Respond with just the cocktail name and one sentence explanation.
+"""
+_TEST_BODY = json_dumps({
+    "anthropic_version": "bedrock-2023-05-31",
+    "messages": [{"role": "user", "content": _TEST_PROMPT}],
+    "max_tokens": 60,
+    "temperature": 0.0
+})
+
+# Pooled keep-alive connections for model invocations
+_RUNTIME_CONFIG_OPTIONS = {
+    'max_pool_connections': 50,
+    'tcp_keepalive': True,
+    'retries': {'max_attempts': 5, 'mode': 'adaptive'}
+}
+
+@functools.cache
+def _session():
+    """One boto3 session per run, so credentials are resolved once"""
+    # boto3 is imported on first use so importing this module stays cheap
+    import boto3
+    return boto3.Session()
+
+@functools.cache
+def _client(service, region):
+    """Build each service client once and reuse it across checks"""
+    from botocore.config import Config
+    config = Config(**_RUNTIME_CONFIG_OPTIONS) if service == 'bedrock-runtime' else None
+    return _session().client(service, region_name=region, config=config)
+
+@functools.cache
+def _caller_identity(region):
+    """STS identity for the current credentials, fetched once per region"""
+    return _client('sts', region).get_caller_identity()
+
+def print_credentials_help():
+    """Explain how to add AWS keys to the .env file"""
+    print("🛠️  Fix by adding to your .env file:")
+    print("AWS_ACCESS_KEY_ID=your_key_here")
+    print("AWS_SECRET_ACCESS_KEY=your_secret_here")
+    print("\n📋 To get AWS keys:")
+    print("1. Go to AWS Console → IAM → Users → Your User")
+    print("2. Security Credentials tab")
+    print("3. Create Access Key")
+    print("4. Copy both keys to your .env file")
 
 def check_aws_setup():
     """Check if AWS is properly configured"""
     print("🔍 Checking AWS Setup...")
     
-    # Load environment
-    load_dotenv()
-    
     # Check environment variables
-    aws_key = os.getenv('AWS_ACCESS_KEY_ID')
-    aws_secret = os.getenv('AWS_SECRET_ACCESS_KEY')
-    aws_region = os.getenv('AWS_REGION', 'us-east-1')
+    aws_key = _ENV['AWS_ACCESS_KEY_ID']
+    aws_secret = _ENV['AWS_SECRET_ACCESS_KEY']
+    aws_region = _ENV['AWS_REGION']
     
     print(f"📍 Region: {aws_region}")
     print(f"🔑 Access Key: {'✅ Set' if aws_key else '❌ Missing'}")
     print(f"🔒 Secret Key: {'✅ Set' if aws_secret else '❌ Missing'}")
     
-    if not aws_key or not aws_secret:
+    # Let boto3's default chain decide: .env keys, AWS_PROFILE, SSO and
+    # instance roles all count, and the session caches what it resolves
+    try:
+        credentials = _session().get_credentials()
+    except Exception as e:
+        # e.g. an AWS_PROFILE that doesn't exist or an unreadable config file
+        print(f"\n❌ AWS credentials could not be loaded: {str(e)}")
+        print_credentials_help()
+        return False
+    
+    if credentials is None:
         print("\n❌ AWS credentials are missing!")
-        print("🛠️  Fix by adding to your .env file:")
-        print("AWS_ACCESS_KEY_ID=your_key_here")
-        print("AWS_SECRET_ACCESS_KEY=your_secret_here")
-        print("\n📋 To get AWS keys:")
-        print("1. Go to AWS Console → IAM → Users → Your User")
-        print("2. Security Credentials tab")
-        print("3. Create Access Key")
-        print("4. Copy both keys to your .env file")
+        print_credentials_help()
         return False
     
+    print(f"🪪 Credentials: ✅ Found ({credentials.method})")
+    
     # Test AWS connection
     try:
         # Test basic AWS connection
-        sts = boto3.client('sts', region_name=aws_region)
-        identity = sts.get_caller_identity()
+        identity = _caller_identity(aws_region)
         print(f"✅ AWS Connection: Success")
         print(f"👤 Account: {identity.get('Account', 'Unknown')}")
         
         # Test Bedrock access
         try:
-            bedrock = boto3.client('bedrock', region_name=aws_region)
-            models = bedrock.list_foundation_models()
+            bedrock = _client('bedrock', aws_region)
+            # Filter server-side to on-demand Anthropic models only
+            models = bedrock.list_foundation_models(
+                byProvider='Anthropic',
+                byInferenceType='ON_DEMAND'
+            )
             print(f"✅ Bedrock Access: Success")
             
             # Check for Claude models
-            claude_models = [m for m in models['modelSummaries'] 
-                           if 'anthropic.claude' in m['modelId']]
-            print(f"🤖 Claude Models Available: {len(claude_models)}")
+            # One pass: keep the first 3 to show, then just count the rest
+            claude_models = (m for m in models['modelSummaries']
+                             if m['modelId'].startswith('anthropic.claude'))
+            first_models = list(islice(claude_models, 3))
+            claude_count = len(first_models) + sum(1 for _ in claude_models)
+            print(f"🤖 Claude Models Available: {claude_count}")
             
-            if claude_models:
-                print("Available Claude models:")
-                for model in claude_models[:3]:  # Show first 3
-                    print(f"   - {model['modelId']}")
+            if first_models:
+                # Build the listing in memory and write it in one go
+                listing = StringIO()
+                listing.write("Available Claude models:\n")
+                for model in first_models:
+                    listing.write(f"   - {model['modelId']}\n")
+                sys.stdout.write(listing.getvalue())
             
         except Exception as e:
             print(f"❌ Bedrock Access: Failed - {str(e)}")
@@ -66,7 +140,7 @@ def check_aws_setup():
             
         # Test Bedrock Runtime (for actual AI calls)
         try:
-            bedrock_runtime = boto3.client('bedrock-runtime', region_name=aws_region)
+            bedrock_runtime = _client('bedrock-runtime', aws_region)
             print(f"✅ Bedrock Runtime: Ready")
             return True
             
@@ -84,32 +158,10 @@ def test_ai_recommendation():
     print("\n🤖 Testing AI Recommendation...")
     
     try:
-        bedrock_runtime = boto3.client('bedrock-runtime', 
-                                     region_name=os.getenv('AWS_REGION', 'us-east-1'))
-        
-        # Simple test prompt
-        test_prompt = """You are a movie and cocktail expert. 
-        
-        Recommend one cocktail for the movie "Casablanca". 
-        Respond with just the cocktail name and one sentence explanation.
-        """
-        
-        # Prepare the request
-        body = json.dumps({
-            "messages": [{"role": "user", "content": test_prompt}],
-            "max_tokens": 150,
-            "temperature": 0.7
-        })
+        bedrock_runtime = _client('bedrock-runtime', _ENV['AWS_REGION'])
         
         # Make the AI call
-        response = bedrock_runtime.invoke_model(
-            modelId='anthropic.claude-3-sonnet-20240229-v1:0',
-            body=body,
-            contentType='application/json'
-        )
-        
-        # Parse response
-        result = json.loads(response['body'].read())
+        result = invoke_model_json(bedrock_runtime, _ENV['BEDROCK_MODEL_ID'], _TEST_BODY)
         ai_response = result['content'][0]['text']
         
         print("✅ AI Test Successful!")
@@ -6,31 +6,129 @@ Robust AI-powered movie & cocktail recommendations with better error handling
 
 import asyncio
 import os
-import sys
 import json
+import logging
 import re
-from typing import Dict, Optional, List
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, List
 import boto3
+from botocore.config import Config as BotoConfig
 from dotenv import load_dotenv
+from src.utils.llm_helpers import invoke_model_json, json_dumps, json_loads, truncate
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Sentence pattern for the regex fallback parser, compiled once
+_SENTENCE = re.compile(r'[.!?]\s*([^.!?]+[.!?])')
+
+# Output budget per recommendation: the JSON answer runs to a few hundred tokens
+_MAX_TOKENS_PER_MOVIE = 400
+
+# AI results kept per agent, keyed by normalized title (least recently used evicted)
+_RECOMMENDATION_CACHE_SIZE = 512
+
+# Rule-based fallback: first pattern found in "genre mood" picks the cocktail
+_FALLBACK_RULES = [
+    (re.compile(r'\b(?:romance|romantic)\b'), 'manhattan',
+     "The Manhattan's sophisticated blend mirrors the complexity of romantic relationships in classic cinema."),
+    (re.compile(r'\b(?:action|crime)\b'), 'old_fashioned',
+     "An Old Fashioned's bold character matches the intensity and strength required for action-packed storytelling."),
+    (re.compile(r'\b(?:mystery|dark)\b'), 'negroni',
+     "The Negroni's bitter complexity perfectly complements the mysterious and contemplative atmosphere."),
+]
+
+def _find_json_span(text: str, start: int) -> Optional[str]:
+    """Return the balanced {...} or [...] block opening at text[start], found in one forward pass"""
+    closers = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            # Brackets inside string values don't count
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            closers.append('}' if char == '{' else ']')
+        elif char in '}]':
+            if not closers or char != closers[-1]:
+                return None  # Mismatched, so not JSON
+            closers.pop()
+            if not closers:
+                return text[start:i + 1]
+    
+    return None  # Never closed
+
+def _find_json_value(text: str, opener: str, accept: Callable[[Any], bool],
+                     partial: bool = False) -> Optional[Any]:
+    """Return the first block starting with opener that decodes to a value accept() allows
+    
+    With partial=True (text still streaming in) an unclosed opener ends the search,
+    so a value nested inside an unfinished one is never returned.
+    """
+    start = text.find(opener)
+    while start != -1:
+        span = _find_json_span(text, start)
+        if span is None and partial:
+            return None
+        if span is not None:
+            try:
+                parsed = json_loads(span)
+            except json.JSONDecodeError:
+                parsed = None
+            if parsed is not None and accept(parsed):
+                return parsed
+        # Prose brackets such as "{this}" or "[3] films": try the next opener
+        start = text.find(opener, start + 1)
+    return None
+
+def _find_json_object(text: str, partial: bool = False) -> Optional[Dict]:
+    """Return the first {...} block in text that decodes to a JSON object"""
+    return _find_json_value(text, '{', lambda value: isinstance(value, dict), partial)
+
+def _find_json_array(text: str) -> Optional[List[Dict]]:
+    """Return the first [...] block in text that decodes to a list of JSON objects"""
+    return _find_json_value(
+        text, '[',
+        lambda value: isinstance(value, list) and all(isinstance(item, dict) for item in value)
+    )
+
 class ImprovedLLMAgent:
     """Improved AI agent with robust LLM API calls"""
     
     def __init__(self):
+        self._recommendation_cache: OrderedDict = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None  # Created by sync_recommend
         self.setup_aws()
         self.setup_data()
         
     def setup_aws(self):
         """Initialize AWS Bedrock client with better error handling"""
         try:
+            # Pooled keep-alive connections shared by concurrent calls; botocore
+            # makes a single attempt (no retries) because call_claude_api already retries
+            client_config = BotoConfig(
+                max_pool_connections=32,
+                tcp_keepalive=True,
+                connect_timeout=5,
+                read_timeout=60,
+                retries={'total_max_attempts': 1, 'mode': 'standard'}
+            )
+            
             self.bedrock_client = boto3.client(
                 'bedrock-runtime',
                 region_name=os.getenv('AWS_REGION', 'us-east-1'),
                 aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                config=client_config
             )
             self.model_id = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
             
@@ -48,20 +146,14 @@ class ImprovedLLMAgent:
             raise Exception("No Bedrock client")
             
         # Simple test call
-        test_body = json.dumps({
+        test_body = json_dumps({
             "anthropic_version": "bedrock-2023-05-31",
             "messages": [{"role": "user", "content": "Hello, respond with just 'OK'"}],
             "max_tokens": 10,
             "temperature": 0.1
         })
         
-        response = self.bedrock_client.invoke_model(
-            modelId=self.model_id,
-            body=test_body,
-            contentType='application/json'
-        )
-        
-        result = json.loads(response['body'].read())
+        result = invoke_model_json(self.bedrock_client, self.model_id, test_body)
         if 'content' not in result:
             raise Exception("Invalid response format")
             
@@ -145,10 +237,42 @@ class ImprovedLLMAgent:
             }
         }
         
+        # Parse release years once for the fallback rules, keyed by title; the
+        # movie records themselves are returned to callers and stay untouched
+        self._movie_years = {
+            movie['title']: int(movie['year'])
+            for movie in self.movies.values() if movie['year'].isdigit()
+        }
+        
+        # The catalog is fixed from here on, so render the prompt section and
+        # the name lookups once instead of on every request
+        self._cocktail_block = chr(10).join(
+            f"- {details['name']}: {details['description']} (Flavors: {', '.join(details['flavor_profile'])})"
+            for details in self.cocktails.values()
+        )
+        self._cocktail_keys_by_name = {}
+        for key, details in self.cocktails.items():
+            self._cocktail_keys_by_name[key] = key
+            self._cocktail_keys_by_name[details['name'].lower()] = key
+        # One alternation over every name, longest first, finds a mention in a single scan
+        self._cocktail_name_pattern = re.compile('|'.join(
+            re.escape(name) for name in sorted(self._cocktail_keys_by_name, key=len, reverse=True)
+        ))
+        self._cocktail_keys = tuple(self.cocktails)
+        self._alternatives = {
+            key: tuple(other for other in self._cocktail_keys if other != key)
+            for key in self._cocktail_keys
+        }
+        
         print(f"✅ Loaded {len(self.cocktails)} cocktails and {len(self.movies)} movies")
     
-    async def get_ai_recommendation(self, movie_title: str) -> Dict:
-        """Get AI recommendation with improved error handling"""
+    async def get_ai_recommendation(self, movie_title: str,
+                                    on_text: Optional[Callable[[str], None]] = None) -> Dict:
+        """Get AI recommendation with improved error handling
+        
+        When on_text is given, Claude's reply is streamed and each text chunk
+        is passed to it as it arrives.
+        """
         
         # Get movie info
         movie_info = self.get_movie_info(movie_title)
@@ -157,56 +281,105 @@ class ImprovedLLMAgent:
             print("⚠️ Using fallback recommendations (no AWS connection)")
             return self.get_smart_fallback(movie_info)
         
+        cached_result = self._get_cached_recommendation(movie_title)
+        if cached_result is not None:
+            return cached_result
+        
         try:
             # Create comprehensive prompt
             prompt = self.create_detailed_prompt(movie_info)
             
             # Make AI call with proper error handling
-            ai_response = await self.call_claude_api(prompt)
+            if on_text:
+                ai_response = await self.call_claude_stream(prompt, on_text)
+            else:
+                ai_response = await self.call_claude_api(prompt)
             
             # Parse and validate response
             parsed_response = self.parse_ai_response(ai_response)
             
-            # Enhance with cocktail details
-            cocktail_details = self.get_cocktail_details(parsed_response['cocktail_name'])
-            
-            return {
-                'success': True,
-                'movie': movie_info,
-                'cocktail': cocktail_details,
-                'explanation': parsed_response['explanation'],
-                'confidence': parsed_response['confidence'],
-                'alternatives': parsed_response['alternatives'],
-                'ai_reasoning': parsed_response.get('reasoning', ''),
-                'source': 'AI'
-            }
+            result = self.build_ai_result(movie_info, parsed_response)
+            self._cache_recommendation(movie_title, result)
+            return result
             
         except Exception as e:
-            print(f"🔄 AI call failed ({str(e)}), using smart fallback")
+            logger.warning("🔄 AI call failed (%s), using smart fallback", e)
             fallback = self.get_smart_fallback(movie_info)
             fallback['source'] = 'Fallback'
             return fallback
     
+    async def get_ai_recommendations_batch(self, movie_titles: List[str]) -> List[Dict]:
+        """Get recommendations for several movies from a single Claude call"""
+        
+        if not self.bedrock_client:
+            return [await self.get_ai_recommendation(title) for title in movie_titles]
+        
+        # Only titles without a cached AI result go into the prompt
+        results = {title: self._get_cached_recommendation(title) for title in movie_titles}
+        misses = [title for title, result in results.items() if result is None]
+        if not misses:
+            return [results[title] for title in movie_titles]
+        
+        movie_infos = [self.get_movie_info(title) for title in misses]
+        
+        try:
+            prompt = self.create_batch_prompt(movie_infos)
+            ai_response = await self.call_claude_api(prompt, max_tokens=_MAX_TOKENS_PER_MOVIE * len(movie_infos))
+            
+            parsed_responses = self.extract_json_array_from_text(ai_response)
+            if not parsed_responses or len(parsed_responses) != len(movie_infos):
+                raise ValueError("Batched response did not contain one result per movie")
+            
+            for title, movie_info, parsed in zip(misses, movie_infos, parsed_responses):
+                results[title] = self.build_ai_result(movie_info, self.validate_ai_response(parsed))
+                self._cache_recommendation(title, results[title])
+            
+        except Exception as e:
+            logger.warning("🔄 Batched AI call failed (%s), asking per movie", e)
+            fresh = await asyncio.gather(*(self.get_ai_recommendation(title) for title in misses))
+            results.update(zip(misses, fresh))
+        
+        return [results[title] for title in movie_titles]
+    
+    def _get_cached_recommendation(self, movie_title: str) -> Optional[Dict]:
+        """Return the cached AI result for the title, if any"""
+        key = movie_title.strip().lower()
+        result = self._recommendation_cache.get(key)
+        if result is not None:
+            self._recommendation_cache.move_to_end(key)
+        return result
+    
+    def _cache_recommendation(self, movie_title: str, result: Dict):
+        """Store an AI result, evicting the least recently used entry"""
+        key = movie_title.strip().lower()
+        self._recommendation_cache[key] = result
+        self._recommendation_cache.move_to_end(key)
+        if len(self._recommendation_cache) > _RECOMMENDATION_CACHE_SIZE:
+            self._recommendation_cache.popitem(last=False)
+    
+    def build_ai_result(self, movie_info: Dict, parsed_response: Dict) -> Dict:
+        """Combine a validated AI response with movie and cocktail details"""
+        return {
+            'success': True,
+            'movie': movie_info,
+            'cocktail': self.get_cocktail_details(parsed_response['cocktail_name']),
+            'explanation': parsed_response['explanation'],
+            'confidence': parsed_response['confidence'],
+            'alternatives': parsed_response['alternatives'],
+            'ai_reasoning': parsed_response.get('reasoning', ''),
+            'source': 'AI'
+        }
+    
     def create_detailed_prompt(self, movie_info: Dict) -> str:
         """Create a detailed, structured prompt for Claude"""
         
-        cocktail_list = []
-        for name, details in self.cocktails.items():
-            cocktail_list.append(f"- {details['name']}: {details['description']} (Flavors: {', '.join(details['flavor_profile'])})")
-        
         prompt = f"""You are a world-renowned sommelier and film critic. Your expertise lies in creating perfect cocktail pairings for movies.
 
 🎬 MOVIE TO ANALYZE:
-Title: {movie_info['title']}
-Year: {movie_info['year']}
-Genre: {movie_info['genre']}
-Director: {movie_info['director']}
-Plot: {movie_info['plot']}
-Mood: {movie_info.get('mood', 'Unknown')}
-IMDB Rating: {movie_info['imdb_rating']}
+{self.format_movie_info(movie_info)}
 
 🍸 AVAILABLE COCKTAILS:
-{chr(10).join(cocktail_list)}
+{self.format_cocktail_list()}
 
 🎯 YOUR TASK:
 Analyze this movie's atmosphere, themes, setting, and emotional tone. Then recommend the ONE cocktail that would create the most perfect pairing experience.
@@ -231,40 +404,154 @@ Important: Use ONLY cocktail names from the provided list. Be specific and confi
 
         return prompt
     
-    async def call_claude_api(self, prompt: str, max_retries: int = 3) -> str:
+    def create_batch_prompt(self, movie_infos: List[Dict]) -> str:
+        """Create one prompt asking for a pairing for each movie, in order"""
+        
+        movie_blocks = [
+            f"[{i}]\n{self.format_movie_info(movie_info)}"
+            for i, movie_info in enumerate(movie_infos, 1)
+        ]
+        
+        prompt = f"""You are a world-renowned sommelier and film critic. Your expertise lies in creating perfect cocktail pairings for movies.
+
+🎬 MOVIES TO ANALYZE:
+{(chr(10) * 2).join(movie_blocks)}
+
+🍸 AVAILABLE COCKTAILS:
+{self.format_cocktail_list()}
+
+🎯 YOUR TASK:
+Analyze each movie's atmosphere, themes, setting, and emotional tone independently. For EACH movie, recommend the ONE cocktail that would create the most perfect pairing experience.
+
+🔍 RESPOND WITH A JSON ARRAY of {len(movie_infos)} objects, one per movie, in the order listed. Each object uses this format:
+{{
+    "cocktail_name": "exact_name_from_list",
+    "explanation": "2-3 sentences explaining why this pairing works perfectly",
+    "confidence": "High",
+    "alternatives": ["second_choice", "third_choice"],
+    "reasoning": "Step-by-step analysis of your decision"
+}}
+
+Important: Output only the JSON array. Use ONLY cocktail names from the provided list."""
+
+        return prompt
+    
+    def format_movie_info(self, movie_info: Dict) -> str:
+        """Render the movie details section of a prompt"""
+        return f"""Title: {movie_info['title']}
+Year: {movie_info['year']}
+Genre: {movie_info['genre']}
+Director: {movie_info['director']}
+Plot: {movie_info['plot']}
+Mood: {movie_info.get('mood', 'Unknown')}
+IMDB Rating: {movie_info['imdb_rating']}"""
+    
+    def format_cocktail_list(self) -> str:
+        """Render the available cocktails section of a prompt"""
+        return self._cocktail_block
+    
+    async def call_claude_api(self, prompt: str, max_retries: int = 3,
+                              max_tokens: int = _MAX_TOKENS_PER_MOVIE) -> str:
         """Make API call to Claude with retries"""
         
         for attempt in range(max_retries):
             try:
-                body = json.dumps({
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 1000,
-                    "temperature": 0.7,
-                    "top_p": 0.9
-                })
+                body = self.build_request_body(prompt, max_tokens)
                 
-                response = self.bedrock_client.invoke_model(
-                    modelId=self.model_id,
-                    body=body,
-                    contentType='application/json'
+                # Run the blocking boto3 call in a worker thread so several
+                # recommendations can be in flight on the event loop at once
+                result = await asyncio.to_thread(
+                    invoke_model_json, self.bedrock_client, self.model_id, body
                 )
                 
-                result = json.loads(response['body'].read())
-                
                 if 'content' in result and len(result['content']) > 0:
                     return result['content'][0]['text']
                 else:
                     raise Exception("Invalid response format")
                     
             except Exception as e:
-                print(f"   Attempt {attempt + 1} failed: {str(e)}")
+                logger.warning("Attempt %d failed: %s", attempt + 1, e)
                 if attempt == max_retries - 1:
                     raise e
                 await asyncio.sleep(1)  # Wait before retry
         
         raise Exception("All API attempts failed")
     
+    async def call_claude_stream(self, prompt: str, on_text: Callable[[str], None],
+                                 max_retries: int = 3,
+                                 max_tokens: int = _MAX_TOKENS_PER_MOVIE) -> str:
+        """Stream Claude's reply, passing text chunks to on_text, and return the full text
+        
+        Failures are retried like call_claude_api, but only while nothing has been
+        passed to on_text yet; a stream that breaks midway is not replayed.
+        """
+        body = self.build_request_body(prompt, max_tokens)
+        emitted = False
+        
+        def forward(text: str):
+            nonlocal emitted
+            emitted = True
+            on_text(text)
+        
+        for attempt in range(max_retries):
+            try:
+                return await asyncio.to_thread(self.stream_model, body, forward)
+                
+            except Exception as e:
+                logger.warning("Attempt %d failed: %s", attempt + 1, e)
+                if emitted or attempt == max_retries - 1:
+                    raise e
+                await asyncio.sleep(1)  # Wait before retry
+        
+        raise Exception("All API attempts failed")
+    
+    def build_request_body(self, prompt: str, max_tokens: int) -> bytes:
+        """Serialize a Claude messages request"""
+        return json_dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": 0.2,
+            "top_p": 0.9,
+            # A bare closing code fence means the JSON answer is already complete
+            # (an opening fence is followed by "json", so it doesn't match)
+            "stop_sequences": ["\n```\n"]
+        })
+    
+    def stream_model(self, body: bytes, on_text: Callable[[str], None]) -> str:
+        """Blocking streaming Bedrock call; stops reading once the JSON answer is complete"""
+        response = self.bedrock_client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=body,
+            contentType='application/json'
+        )
+        stream = response['body']
+        
+        chunks = []
+        try:
+            for event in stream:
+                if 'chunk' not in event:
+                    continue
+                payload = json_loads(event['chunk']['bytes'])
+                if payload.get('type') != 'content_block_delta':
+                    continue
+                
+                text = payload['delta'].get('text', '')
+                if not text:
+                    continue
+                chunks.append(text)
+                on_text(text)
+                
+                # The reasoning after the closing brace isn't needed
+                if '}' in text and _find_json_object(''.join(chunks), partial=True) is not None:
+                    break
+        finally:
+            stream.close()
+        
+        if not chunks:
+            raise Exception("Empty streamed response")
+        return ''.join(chunks)
+    
     def parse_ai_response(self, ai_text: str) -> Dict:
         """Parse AI response with multiple fallback strategies"""
         
@@ -293,47 +580,39 @@ Important: Use ONLY cocktail names from the provided list. Be specific and confi
         text = text.strip()
         
         # Try to find JSON block
-        json_patterns = [
-            r'\{[^{}]*\}',  # Simple JSON object
-            r'\{.*\}',      # Any JSON object
-        ]
-        
-        for pattern in json_patterns:
-            matches = re.findall(pattern, text, re.DOTALL)
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except json.JSONDecodeError:
-                    continue
+        json_object = _find_json_object(text)
+        if json_object is not None:
+            return json_object
         
         # Try parsing the whole text
         try:
-            return json.loads(text)
+            return json_loads(text)
         except json.JSONDecodeError:
             return None
     
+    def extract_json_array_from_text(self, text: str) -> Optional[List[Dict]]:
+        """Extract a JSON array of result objects from a batched response"""
+        return _find_json_array(text)
+    
     def extract_info_with_regex(self, text: str) -> Dict:
         """Extract information using regex when JSON parsing fails"""
         
         # Extract cocktail name
-        cocktail_name = None
-        for name in self.cocktails.keys():
-            if name.lower() in text.lower() or self.cocktails[name]['name'].lower() in text.lower():
-                cocktail_name = name
-                break
-        
-        if not cocktail_name:
+        name_match = self._cocktail_name_pattern.search(text.lower())
+        if name_match:
+            cocktail_name = self._cocktail_keys_by_name[name_match.group()]
+        else:
             cocktail_name = 'martini'  # Default
         
         # Extract explanation (first sentence or paragraph)
-        explanation_match = re.search(r'[.!?]\s*([^.!?]+[.!?])', text)
-        explanation = explanation_match.group(1) if explanation_match else text[:200] + "..."
+        explanation_match = _SENTENCE.search(text)
+        explanation = explanation_match.group(1) if explanation_match else truncate(text, 200)
         
         return {
             'cocktail_name': cocktail_name,
             'explanation': explanation,
             'confidence': 'Medium',
-            'alternatives': [name for name in self.cocktails.keys() if name != cocktail_name][:2],
+            'alternatives': list(self._alternatives[cocktail_name][:2]),
             'reasoning': 'Extracted from AI text response'
         }
     
@@ -341,10 +620,11 @@ Important: Use ONLY cocktail names from the provided list. Be specific and confi
         """Validate and clean AI response"""
         
         # Ensure cocktail name is valid
-        cocktail_name = response.get('cocktail_name', '').lower().replace(' ', '_')
+        raw_name = response.get('cocktail_name', '').lower()
+        cocktail_name = self._cocktail_keys_by_name.get(raw_name, raw_name.replace(' ', '_'))
         if cocktail_name not in self.cocktails:
             # Try to find close match
-            for name in self.cocktails.keys():
+            for name in self._cocktail_keys:
                 if name in cocktail_name or cocktail_name in name:
                     cocktail_name = name
                     break
@@ -355,17 +635,17 @@ Important: Use ONLY cocktail names from the provided list. Be specific and confi
         alternatives = response.get('alternatives', [])
         valid_alternatives = []
         for alt in alternatives:
-            alt_clean = alt.lower().replace(' ', '_')
+            alt_lower = alt.lower()
+            alt_clean = self._cocktail_keys_by_name.get(alt_lower, alt_lower.replace(' ', '_'))
             if alt_clean in self.cocktails and alt_clean != cocktail_name:
                 valid_alternatives.append(alt_clean)
         
         # Add more alternatives if needed
-        while len(valid_alternatives) < 2:
-            for name in self.cocktails.keys():
-                if name != cocktail_name and name not in valid_alternatives:
-                    valid_alternatives.append(name)
-                    break
-            break
+        for name in self._alternatives[cocktail_name]:
+            if len(valid_alternatives) >= 2:
+                break
+            if name not in valid_alternatives:
+                valid_alternatives.append(name)
         
         return {
             'cocktail_name': cocktail_name,
@@ -399,29 +679,23 @@ Important: Use ONLY cocktail names from the provided list. Be specific and confi
     
     def get_smart_fallback(self, movie_info: Dict) -> Dict:
         """Intelligent fallback recommendations"""
-        genre = movie_info.get('genre', '').lower()
-        year = movie_info.get('year', '')
-        mood = movie_info.get('mood', '').lower()
+        text = f"{movie_info.get('genre', '')} {movie_info.get('mood', '')}".lower()
+        year = self._movie_years.get(movie_info.get('title'))
         
         # Smart rule-based selection
-        if 'romance' in genre or 'romantic' in mood:
-            cocktail = 'manhattan'
-            explanation = "The Manhattan's sophisticated blend mirrors the complexity of romantic relationships in classic cinema."
-        elif 'action' in genre or 'crime' in genre:
-            cocktail = 'old_fashioned'
-            explanation = "An Old Fashioned's bold character matches the intensity and strength required for action-packed storytelling."
-        elif 'mystery' in genre or 'dark' in mood:
-            cocktail = 'negroni'
-            explanation = "The Negroni's bitter complexity perfectly complements the mysterious and contemplative atmosphere."
-        elif year and year.isdigit() and int(year) < 1970:
-            cocktail = 'martini'
-            explanation = "A classic Martini captures the timeless elegance and sophistication of golden age cinema."
+        for pattern, cocktail, explanation in _FALLBACK_RULES:
+            if pattern.search(text):
+                break
         else:
-            cocktail = 'manhattan'
-            explanation = "A Manhattan provides the perfect sophisticated backdrop for any great film experience."
+            if year is not None and year < 1970:
+                cocktail = 'martini'
+                explanation = "A classic Martini captures the timeless elegance and sophistication of golden age cinema."
+            else:
+                cocktail = 'manhattan'
+                explanation = "A Manhattan provides the perfect sophisticated backdrop for any great film experience."
         
         cocktail_details = self.get_cocktail_details(cocktail)
-        alternatives = [name for name in self.cocktails.keys() if name != cocktail][:2]
+        alternatives = list(self._alternatives[cocktail][:2])
         
         return {
             'success': True,
@@ -434,9 +708,22 @@ Important: Use ONLY cocktail names from the provided list. Be specific and confi
             'source': 'Smart Fallback'
         }
     
-    def sync_recommend(self, movie_title: str) -> Dict:
+    def sync_recommend(self, movie_title: str,
+                       on_text: Optional[Callable[[str], None]] = None) -> Dict:
         """Synchronous wrapper"""
-        return asyncio.run(self.get_ai_recommendation(movie_title))
+        # Reuse one event loop (and its worker threads) across calls instead of
+        # building and tearing one down per query; close() releases it
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+        return self._loop.run_until_complete(self.get_ai_recommendation(movie_title, on_text))
+    
+    def close(self):
+        """Shut down the event loop used by sync_recommend"""
+        if self._loop is None:
+            return
+        self._loop.run_until_complete(self._loop.shutdown_default_executor())
+        self._loop.close()
+        self._loop = None
 
 
 async def test_improved_llm():
@@ -454,12 +741,13 @@ async def test_improved_llm():
         "Inception"
     ]
     
-    for movie in test_movies:
+    # One Claude call covers every movie; results print in input order
+    results = await agent.get_ai_recommendations_batch(test_movies)
+    
+    for movie, result in zip(test_movies, results):
         print(f"\n🎬 Testing: {movie}")
         print("-" * 40)
         
-        result = await agent.get_ai_recommendation(movie)
-        
         if result['success']:
             print(f"🍸 Cocktail: {result['cocktail']['name']}")
             print(f"🥃 Glass: {result['cocktail']['glass']}")
@@ -485,25 +773,30 @@ def interactive_test():
     
     agent = ImprovedLLMAgent()
     
-    while True:
-        movie = input("\nEnter movie title: ").strip()
-        if movie.lower() in ['quit', 'exit', 'q']:
-            break
-            
-        if not movie:
-            continue
+    try:
+        while True:
+            movie = input("\nEnter movie title: ").strip()
+            if movie.lower() in ['quit', 'exit', 'q']:
+                break
+                
+            if not movie:
+                continue
+                
+            print(f"🤔 Processing '{movie}' with AI...")
+            # Show Claude's reply as it streams in rather than after it finishes
+            result = agent.sync_recommend(movie, on_text=lambda text: print(text, end='', flush=True))
+            print()
             
-        print(f"🤔 Processing '{movie}' with AI...")
-        result = agent.sync_recommend(movie)
-        
-        if result['success']:
-            print(f"\n✨ Perfect Pairing Found!")
-            print(f"🎬 Movie: {result['movie']['title']}")
-            print(f"🍸 Cocktail: {result['cocktail']['name']}")
-            print(f"💭 Explanation: {result['explanation']}")
-            print(f"🤖 Source: {result['source']}")
-        else:
-            print(f"❌ Error: {result.get('error', 'Unknown error')}")
+            if result['success']:
+                print(f"\n✨ Perfect Pairing Found!")
+                print(f"🎬 Movie: {result['movie']['title']}")
+                print(f"🍸 Cocktail: {result['cocktail']['name']}")
+                print(f"💭 Explanation: {result['explanation']}")
+                print(f"🤖 Source: {result['source']}")
+            else:
+                print(f"❌ Error: {result.get('error', 'Unknown error')}")
+    finally:
+        agent.close()
 
 if __name__ == "__main__":
     print("Choose test mode:")
@@ -6,17 +6,18 @@ Complete working demo of your AI-powered recommendation system
 
 import asyncio
 import os
-import sys
 import json
+import logging
+import re
 from typing import Dict, Optional
 import boto3
 from dotenv import load_dotenv
+from src.utils.llm_helpers import invoke_model_json, truncate
 
 # Load environment variables
 load_dotenv()
 
-# Add src to path so we can import our modules
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+logger = logging.getLogger(__name__)
 
 class MovieCocktailAgent:
     """AI agent that recommends cocktails for movies"""
@@ -94,6 +95,11 @@ class MovieCocktailAgent:
         except Exception as e:
             print(f"⚠️ Error loading cocktail data: {e}")
             self.cocktails = {}
+        
+        # One compiled alternation finds the first cocktail mentioned in a reply;
+        # longer names go first so they win over names they contain
+        names = sorted(self.cocktails, key=len, reverse=True)
+        self._cocktail_pattern = re.compile('|'.join(map(re.escape, names))) if names else None
             
     def load_movie_data(self):
         """Load movie database (using OMDB API or mock data)"""
@@ -221,14 +227,10 @@ Choose from the available cocktails list only."""
                 "temperature": 0.7
             })
             
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=body,
-                contentType='application/json'
+            # Run the blocking boto3 call off the event loop
+            result = await asyncio.to_thread(
+                invoke_model_json, self.bedrock_client, self.model_id, body
             )
-            
-            # Parse response
-            result = json.loads(response['body'].read())
             ai_text = result['content'][0]['text']
             
             # Try to parse JSON response
@@ -247,21 +249,20 @@ Choose from the available cocktails list only."""
                 # If JSON parsing fails, extract info manually
                 return {
                     "cocktail_name": self.extract_cocktail_name(ai_text),
-                    "explanation": ai_text[:200] + "...",
+                    "explanation": truncate(ai_text, 200),
                     "confidence": "Medium",
                     "alternatives": list(self.cocktails.keys())[:2]
                 }
                 
         except Exception as e:
-            print(f"AI recommendation failed: {e}")
+            logger.warning("AI recommendation failed: %s", e)
             return self.get_fallback_recommendation(movie_info)
     
     def extract_cocktail_name(self, text: str) -> str:
         """Extract cocktail name from AI text"""
-        text_lower = text.lower()
-        for cocktail_name in self.cocktails.keys():
-            if cocktail_name in text_lower:
-                return cocktail_name
+        match = self._cocktail_pattern.search(text.lower()) if self._cocktail_pattern else None
+        if match:
+            return match.group(0)
         return 'martini'  # Default fallback
     
     def get_fallback_recommendation(self, movie_info: Dict) -> Dict:
@@ -322,12 +323,15 @@ async def run_demo():
         "Pulp Fiction"
     ]
     
-    for movie in test_movies:
+    # Request every pairing at once; the Bedrock calls overlap in worker threads
+    results = await asyncio.gather(
+        *(agent.get_cocktail_for_movie(movie) for movie in test_movies)
+    )
+    
+    for movie, result in zip(test_movies, results):
         print(f"\n🎬 Movie: {movie}")
         print("-" * 40)
         
-        result = await agent.get_cocktail_for_movie(movie)
-        
         if result['success']:
             print(f"🍸 Recommended Cocktail: {result['cocktail']['name']}")
             print(f"🥃 Glass: {result['cocktail']['glass']}")
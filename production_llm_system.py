@@ -6,12 +6,14 @@ Enterprise-grade AI-powered recommendations with bulletproof error handling
 
 import asyncio
 import os
-import sys
 import json
 import re
-from typing import Dict, Optional, List, Any
-import boto3
+import time
+from collections import OrderedDict
+from itertools import chain, islice
+from typing import Any, Callable, Dict, Optional, List
 from dotenv import load_dotenv
+from src.utils.llm_helpers import invoke_model_json, json_dumps, json_loads, truncate
 import logging
 from datetime import datetime
 
@@ -22,12 +24,149 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+
+def _strip_code_fences(text: str) -> str:
+    """Remove markdown code fences Claude sometimes wraps JSON in"""
+    cleaned = text.strip()
+    for marker in ['```json', '```JSON', '```', '`']:
+        if cleaned.startswith(marker):
+            cleaned = cleaned[len(marker):]
+        if cleaned.endswith(marker):
+            cleaned = cleaned[:-len(marker)]
+    return cleaned.strip()
+
+
+def _find_json_span(text: str, start: int) -> Optional[str]:
+    """Return the balanced JSON object/array opening at text[start], closing it if truncated"""
+    closers = []
+    in_string = escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            closers.append('}' if char == '{' else ']')
+        elif char in '}]':
+            if not closers or char != closers[-1]:
+                return None
+            closers.pop()
+            if not closers:
+                return text[start:i + 1]
+    
+    # Output was cut off (e.g. max_tokens): close the open string and containers
+    return text[start:] + ('"' if in_string else '') + ''.join(reversed(closers))
+
+
+def _parse_claude_json(text: str, opener: str = '{',
+                       accept: Optional[Callable[[Any], bool]] = None) -> Optional[Any]:
+    """Parse JSON from Claude output, tolerating prose, fences, trailing commas and truncation
+    
+    Every opener in the text is tried in turn until a span decodes to a value that
+    accept() allows (by default, a dict for '{' and a list for '[').
+    """
+    if accept is None:
+        expected_type = dict if opener == '{' else list
+        accept = lambda value: isinstance(value, expected_type)
+    
+    cleaned = _strip_code_fences(text)
+    try:
+        parsed = json_loads(cleaned)
+        if accept(parsed):
+            return parsed
+    except json.JSONDecodeError:
+        pass
+    
+    start = cleaned.find(opener)
+    while start != -1:
+        span = _find_json_span(cleaned, start)
+        if span is not None:
+            for candidate in (span, _TRAILING_COMMA.sub(r'\1', span)):
+                try:
+                    parsed = json_loads(candidate)
+                except json.JSONDecodeError:
+                    continue
+                if accept(parsed):
+                    return parsed
+        # Prose brackets such as "[4] films" or "{below}": move on to the next opener
+        start = cleaned.find(opener, start + 1)
+    return None
+
+
+# Films per batched Claude prompt, and the output budget reserved for each
+BATCH_SIZE = 4
+MAX_TOKENS_PER_MOVIE = 600
+
+# Bounded LRU of AI results keyed by normalized title; entries expire after the TTL
+RECOMMENDATION_CACHE_SIZE = 1024
+RECOMMENDATION_CACHE_TTL_SECONDS = 3600
+
+# Known movies with rich context, keyed by lowercased title
+KNOWN_MOVIES = {
+    'casablanca': {
+        'title': 'Casablanca',
+        'year': '1942',
+        'genre': 'Drama, Romance, War',
+        'director': 'Michael Curtiz',
+        'setting': 'WWII Morocco',
+        'mood': 'romantic, nostalgic, sophisticated',
+        'themes': 'sacrifice, love, duty',
+        'visual_style': 'classic Hollywood, black and white',
+        'cultural_significance': 'timeless classic'
+    },
+    'blade runner 2049': {
+        'title': 'Blade Runner 2049',
+        'year': '2017',
+        'genre': 'Sci-Fi, Drama',
+        'director': 'Denis Villeneuve',
+        'setting': 'dystopian future Los Angeles',
+        'mood': 'dark, contemplative, atmospheric',
+        'themes': 'identity, humanity, memory',
+        'visual_style': 'neo-noir, cyberpunk',
+        'cultural_significance': 'modern sci-fi masterpiece'
+    },
+    'the godfather': {
+        'title': 'The Godfather',
+        'year': '1972',
+        'genre': 'Crime, Drama',
+        'director': 'Francis Ford Coppola',
+        'setting': '1940s-50s New York',
+        'mood': 'intense, dramatic, sophisticated',
+        'themes': 'family, power, corruption',
+        'visual_style': 'dark, intimate cinematography',
+        'cultural_significance': 'cinema masterpiece'
+    }
+}
+
+PAIRING_FACTORS = ("Weigh historical period, emotional atmosphere, visual aesthetic, "
+                   "flavor complexity and character dynamics.")
+
+RECOMMENDATION_JSON_FORMAT = """{
+    "cocktail_name": "cocktail_key_from_list",
+    "confidence_score": 95,
+    "primary_explanation": "Primary reason this pairing works (1-2 sentences)",
+    "detailed_analysis": "Analysis of the pairing (2-3 sentences)",
+    "flavor_harmony": "How flavors complement the film experience",
+    "cultural_connection": "Historical or cultural links between drink and film",
+    "alternatives": ["second_choice", "third_choice"],
+    "expert_notes": "Additional sommelier insights"
+}"""
+
 class ProductionLLMAgent:
     """Production-ready AI agent with enterprise-grade error handling"""
     
     def __init__(self):
         self.setup_aws()
         self.setup_data()
+        self._recommendation_cache: OrderedDict = OrderedDict()
         self.api_calls_made = 0
         self.successful_calls = 0
         self.start_time = datetime.now()
@@ -40,42 +179,54 @@ class ProductionLLMAgent:
             missing_vars = [var for var in required_vars if not os.getenv(var)]
             
             if missing_vars:
-                logger.warning(f"Missing AWS environment variables: {missing_vars}")
+                logger.warning("Missing AWS environment variables: %s", missing_vars)
                 self.bedrock_client = None
                 return
             
+            # Imported here so fallback-only runs never pay for loading boto3
+            import boto3
+            from botocore.config import Config as BotoConfig
+            
+            # Keep warm TLS connections for concurrent/batched calls. botocore makes a
+            # single attempt so retries happen only in _call_claude_with_retries;
+            # adaptive mode adds client-side throttling.
+            client_config = BotoConfig(
+                max_pool_connections=int(os.getenv('BEDROCK_POOL_SIZE', '64')),
+                tcp_keepalive=True,
+                connect_timeout=5,
+                read_timeout=60,
+                retries={'total_max_attempts': 1, 'mode': 'adaptive'}
+            )
+            
             self.bedrock_client = boto3.client(
                 'bedrock-runtime',
                 region_name=os.getenv('AWS_REGION', 'us-east-1'),
                 aws_access_key_id=os.getenv('AWS_ACCESS_KEY_ID'),
-                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY')
+                aws_secret_access_key=os.getenv('AWS_SECRET_ACCESS_KEY'),
+                config=client_config
             )
             
             self.model_id = os.getenv('BEDROCK_MODEL_ID', 'anthropic.claude-3-sonnet-20240229-v1:0')
+            # 'optimized' routes to Bedrock's latency-optimized backend where supported
+            self.latency_mode = os.getenv('BEDROCK_LATENCY_MODE', 'optimized')
             
             # Test connection
             self._test_connection()
             logger.info("✅ AWS Bedrock initialized successfully")
             
         except Exception as e:
-            logger.error(f"❌ AWS setup failed: {e}")
+            logger.error("❌ AWS setup failed: %s", e)
             self.bedrock_client = None
     
     def _test_connection(self):
         """Test AWS connection with minimal call"""
-        test_body = json.dumps({
+        test_body = json_dumps({
             "anthropic_version": "bedrock-2023-05-31",
             "messages": [{"role": "user", "content": "Test"}],
             "max_tokens": 5
         })
         
-        response = self.bedrock_client.invoke_model(
-            modelId=self.model_id,
-            body=test_body,
-            contentType='application/json'
-        )
-        
-        result = json.loads(response['body'].read())
+        result = invoke_model_json(self.bedrock_client, self.model_id, test_body)
         if 'content' not in result:
             raise Exception("Invalid response format")
     
@@ -139,7 +290,26 @@ class ProductionLLMAgent:
             }
         }
         
-        logger.info(f"✅ Loaded {len(self.cocktails)} premium cocktails")
+        # The collection is fixed after setup, so render its prompt block once
+        self._cocktail_collection_block = self._format_cocktail_collection()
+        
+        # Lowercased match terms for finding cocktail names in free text
+        self._cocktail_name_lookup = {}
+        for key, details in self.cocktails.items():
+            name_lower = details['name'].lower()
+            for variant in (key, name_lower, name_lower.replace(' ', '_')):
+                self._cocktail_name_lookup[variant] = key
+        self._cocktail_match_terms = tuple(
+            (key, (key, details['name'].lower())) for key, details in self.cocktails.items()
+        )
+        self._cocktail_partial_terms = tuple(
+            (key, tuple(word for word in key.split('_') if len(word) > 3))
+            for key in self.cocktails
+        )
+        # Memoized name -> key resolutions; movies often share the same picks
+        self._cocktail_key_cache: Dict[str, Optional[str]] = {}
+        
+        logger.info("✅ Loaded %d premium cocktails", len(self.cocktails))
     
     async def get_recommendation(self, movie_title: str) -> Dict[str, Any]:
         """Main recommendation method with comprehensive error handling"""
@@ -147,6 +317,18 @@ class ProductionLLMAgent:
         start_time = datetime.now()
         
         try:
+            # Repeat titles are served from the cache instead of a new Bedrock call
+            cached_result = self._get_cached_recommendation(movie_title)
+            if cached_result is not None:
+                self.successful_calls += 1
+                return {
+                    **cached_result,
+                    'processing_time_seconds': (datetime.now() - start_time).total_seconds(),
+                    'api_call_number': self.api_calls_made,
+                    'source': 'AI (cached)',
+                    'model': self.model_id
+                }
+            
             # Get movie context
             movie_context = self._get_movie_context(movie_title)
             
@@ -154,6 +336,7 @@ class ProductionLLMAgent:
             if self.bedrock_client:
                 try:
                     ai_result = await self._get_ai_recommendation(movie_context)
+                    self._cache_recommendation(movie_title, ai_result)
                     self.successful_calls += 1
                     processing_time = (datetime.now() - start_time).total_seconds()
                     
@@ -166,7 +349,7 @@ class ProductionLLMAgent:
                     }
                     
                 except Exception as e:
-                    logger.warning(f"AI recommendation failed: {e}, using fallback")
+                    logger.warning("AI recommendation failed: %s, using fallback", e)
             
             # Use intelligent fallback
             fallback_result = self._get_intelligent_fallback(movie_context)
@@ -180,7 +363,7 @@ class ProductionLLMAgent:
             }
             
         except Exception as e:
-            logger.error(f"Complete recommendation failure: {e}")
+            logger.error("Complete recommendation failure: %s", e)
             return {
                 'success': False,
                 'error': str(e),
@@ -188,48 +371,96 @@ class ProductionLLMAgent:
                 'processing_time_seconds': (datetime.now() - start_time).total_seconds()
             }
     
+    async def get_recommendations(self, movie_titles: List[str]) -> List[Dict[str, Any]]:
+        """Recommend cocktails for several movies, sharing one Claude call per batch"""
+        # Only titles missing from the cache go to Claude
+        misses = list(dict.fromkeys(
+            title for title in movie_titles if self._get_cached_recommendation(title) is None
+        ))
+        fresh = {}
+        for i in range(0, len(misses), BATCH_SIZE):
+            batch = misses[i:i + BATCH_SIZE]
+            fresh.update(zip(batch, await self._get_batch_recommendations(batch)))
+        
+        return [fresh[title] if title in fresh else await self.get_recommendation(title)
+                for title in movie_titles]
+    
+    async def _get_batch_recommendations(self, movie_titles: List[str]) -> List[Dict[str, Any]]:
+        """Get recommendations for one batch, falling back to per-movie calls on failure"""
+        if not self.bedrock_client:
+            return await self._get_single_recommendations(movie_titles)
+        
+        start_time = datetime.now()
+        movie_contexts = [self._get_movie_context(title) for title in movie_titles]
+        
+        try:
+            prompt = self._create_batch_prompt(movie_contexts)
+            ai_response = await self._call_claude_with_retries(
+                prompt, max_tokens=MAX_TOKENS_PER_MOVIE * len(movie_contexts)
+            )
+            parsed_results = self._extract_json_array(ai_response)
+            if not parsed_results or len(parsed_results) != len(movie_contexts):
+                raise ValueError("Batched response did not contain one result per movie")
+            
+            validated = [
+                self._validate_and_enhance_response(parsed, context)
+                for parsed, context in zip(parsed_results, movie_contexts)
+            ]
+        except Exception as e:
+            logger.warning("Batched AI recommendation failed: %s, falling back to single calls", e)
+            return await self._get_single_recommendations(movie_titles)
+        
+        processing_time = (datetime.now() - start_time).total_seconds()
+        results = []
+        for title, ai_result in zip(movie_titles, validated):
+            self._cache_recommendation(title, ai_result)
+            self.api_calls_made += 1
+            self.successful_calls += 1
+            results.append({
+                **ai_result,
+                'processing_time_seconds': processing_time,
+                'api_call_number': self.api_calls_made,
+                'source': 'AI (batched)',
+                'model': self.model_id
+            })
+        return results
+    
+    async def _get_single_recommendations(self, movie_titles: List[str]) -> List[Dict[str, Any]]:
+        """Run per-movie recommendations concurrently, preserving input order"""
+        return list(await asyncio.gather(
+            *(self.get_recommendation(title) for title in movie_titles)
+        ))
+    
+    def _get_cached_recommendation(self, movie_title: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached AI result for the title, if any"""
+        key = movie_title.strip().lower()
+        entry = self._recommendation_cache.get(key)
+        if entry is None:
+            return None
+        
+        stored_at, result = entry
+        if time.monotonic() - stored_at > RECOMMENDATION_CACHE_TTL_SECONDS:
+            del self._recommendation_cache[key]
+            return None
+        
+        self._recommendation_cache.move_to_end(key)
+        return result
+    
+    def _cache_recommendation(self, movie_title: str, result: Dict[str, Any]):
+        """Store a successful AI result, evicting the least recently used entry"""
+        if not result.get('success'):
+            return
+        key = movie_title.strip().lower()
+        self._recommendation_cache[key] = (time.monotonic(), result)
+        self._recommendation_cache.move_to_end(key)
+        if len(self._recommendation_cache) > RECOMMENDATION_CACHE_SIZE:
+            self._recommendation_cache.popitem(last=False)
+    
     def _get_movie_context(self, movie_title: str) -> Dict[str, str]:
         """Get or create movie context"""
-        # Known movies with rich context
-        known_movies = {
-            'casablanca': {
-                'title': 'Casablanca',
-                'year': '1942',
-                'genre': 'Drama, Romance, War',
-                'director': 'Michael Curtiz',
-                'setting': 'WWII Morocco',
-                'mood': 'romantic, nostalgic, sophisticated',
-                'themes': 'sacrifice, love, duty',
-                'visual_style': 'classic Hollywood, black and white',
-                'cultural_significance': 'timeless classic'
-            },
-            'blade runner 2049': {
-                'title': 'Blade Runner 2049',
-                'year': '2017',
-                'genre': 'Sci-Fi, Drama',
-                'director': 'Denis Villeneuve',
-                'setting': 'dystopian future Los Angeles',
-                'mood': 'dark, contemplative, atmospheric',
-                'themes': 'identity, humanity, memory',
-                'visual_style': 'neo-noir, cyberpunk',
-                'cultural_significance': 'modern sci-fi masterpiece'
-            },
-            'the godfather': {
-                'title': 'The Godfather',
-                'year': '1972',
-                'genre': 'Crime, Drama',
-                'director': 'Francis Ford Coppola',
-                'setting': '1940s-50s New York',
-                'mood': 'intense, dramatic, sophisticated',
-                'themes': 'family, power, corruption',
-                'visual_style': 'dark, intimate cinematography',
-                'cultural_significance': 'cinema masterpiece'
-            }
-        }
-        
         movie_key = movie_title.lower().strip()
-        if movie_key in known_movies:
-            return known_movies[movie_key]
+        if movie_key in KNOWN_MOVIES:
+            return dict(KNOWN_MOVIES[movie_key])
         
         # Generate context for unknown movies
         return {
@@ -264,20 +495,47 @@ class ProductionLLMAgent:
     def _create_advanced_prompt(self, movie_context: Dict[str, str]) -> str:
         """Create advanced prompt with detailed context"""
         
-        cocktail_profiles = []
-        for name, details in self.cocktails.items():
-            profile = f"""
-🍸 {details['name']} ({details['era']})
-   Personality: {details['personality']}
-   Flavors: {', '.join(details['flavor_profile'])}
-   Strength: {details['strength']}
-   Context: {details['description']}"""
-            cocktail_profiles.append(profile)
+        prompt = f"""You are an expert cocktail sommelier and film critic. Pick the ONE cocktail that best pairs with this film.
+
+FILM:
+{self._format_film_context(movie_context)}
+
+COCKTAILS (key|era|flavors|strength):
+{self._cocktail_collection_block}
+
+{PAIRING_FACTORS}
+
+Respond with only this JSON, using cocktail keys from the list:
+{RECOMMENDATION_JSON_FORMAT}"""
+
+        return prompt
+    
+    def _create_batch_prompt(self, movie_contexts: List[Dict[str, str]]) -> str:
+        """Create one prompt that asks for a pairing for every film in the batch"""
+        
+        film_blocks = [
+            f"[{i}]\n{self._format_film_context(context)}"
+            for i, context in enumerate(movie_contexts, 1)
+        ]
         
-        prompt = f"""You are the world's most renowned cocktail sommelier and film expert, with decades of experience pairing drinks with cinematic experiences.
+        prompt = f"""You are an expert cocktail sommelier and film critic. For EACH film, independently pick the ONE cocktail that best pairs with it.
+
+FILMS:
+{(chr(10) * 2).join(film_blocks)}
 
-🎬 FILM ANALYSIS:
-Title: {movie_context['title']}
+COCKTAILS (key|era|flavors|strength):
+{self._cocktail_collection_block}
+
+{PAIRING_FACTORS}
+
+Respond with only a JSON array of exactly {len(movie_contexts)} objects, one per film in the order listed, using cocktail keys from the list. Each object:
+{RECOMMENDATION_JSON_FORMAT}"""
+
+        return prompt
+    
+    def _format_film_context(self, movie_context: Dict[str, str]) -> str:
+        """Render the film details section of a prompt"""
+        return f"""Title: {movie_context['title']}
 Year: {movie_context['year']}
 Genre: {movie_context['genre']}
 Director: {movie_context['director']}
@@ -285,59 +543,36 @@ Setting: {movie_context['setting']}
 Mood: {movie_context['mood']}
 Themes: {movie_context['themes']}
 Visual Style: {movie_context['visual_style']}
-Cultural Impact: {movie_context['cultural_significance']}
-
-🍸 AVAILABLE COCKTAIL COLLECTION:
-{chr(10).join(cocktail_profiles)}
-
-🎯 YOUR EXPERT MISSION:
-Analyze every aspect of this film - its emotional journey, visual aesthetics, historical context, and thematic depth. Then select the ONE cocktail that creates the most harmonious and meaningful pairing experience.
-
-Consider these sophisticated factors:
-• Historical period alignment and cultural context
-• Emotional resonance between drink and film atmosphere  
-• Visual aesthetic harmony (colors, textures, presentation)
-• Flavor complexity matching narrative sophistication
-• Character psychology and social dynamics
-• Optimal viewing experience enhancement
-
-📋 RESPOND IN THIS EXACT JSON FORMAT:
-{{
-    "cocktail_name": "exact_name_from_collection",
-    "confidence_score": 95,
-    "primary_explanation": "Primary reason this pairing works (1-2 sentences)",
-    "detailed_analysis": "Comprehensive analysis of the pairing (3-4 sentences)",
-    "flavor_harmony": "How flavors complement the film experience",
-    "cultural_connection": "Historical or cultural links between drink and film",
-    "alternatives": ["second_choice", "third_choice"],
-    "expert_notes": "Additional sommelier insights"
-}}
-
-CRITICAL: Use only cocktail names from the provided collection. Be confident and specific in your analysis."""
-
-        return prompt
+Cultural Impact: {movie_context['cultural_significance']}"""
     
-    async def _call_claude_with_retries(self, prompt: str, max_retries: int = 3) -> str:
+    def _format_cocktail_collection(self) -> str:
+        """Render the cocktail collection as a compact one-line-per-cocktail menu"""
+        return chr(10).join(
+            f"{key}|{details['era']}|{','.join(details['flavor_profile'])}|{details['strength']}"
+            for key, details in self.cocktails.items()
+        )
+    
+    async def _call_claude_with_retries(self, prompt: str, max_retries: int = 3,
+                                        max_tokens: int = MAX_TOKENS_PER_MOVIE) -> str:
         """Call Claude API with exponential backoff"""
         
         for attempt in range(max_retries):
             try:
-                body = json.dumps({
+                body = json_dumps({
                     "anthropic_version": "bedrock-2023-05-31",
                     "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": 1500,
+                    "max_tokens": max_tokens,
                     "temperature": 0.7,
                     "top_p": 0.9,
-                    "top_k": 250
+                    "top_k": 250,
+                    # Stop at a bare closing code fence (an opening one reads "```json");
+                    # whitespace-only stop sequences are rejected by the API
+                    "stop_sequences": ["\n```\n"]
                 })
                 
-                response = self.bedrock_client.invoke_model(
-                    modelId=self.model_id,
-                    body=body,
-                    contentType='application/json'
-                )
-                
-                result = json.loads(response['body'].read())
+                # boto3 is synchronous; run the round-trip in a worker thread
+                # so concurrent recommendations don't stall the event loop
+                result = await asyncio.to_thread(self._invoke_model, body)
                 
                 if 'content' in result and len(result['content']) > 0:
                     return result['content'][0]['text']
@@ -346,7 +581,7 @@ CRITICAL: Use only cocktail names from the provided collection. Be confident and
                     
             except Exception as e:
                 wait_time = (2 ** attempt) + 1  # Exponential backoff
-                logger.warning(f"API attempt {attempt + 1} failed: {e}")
+                logger.warning("API attempt %d failed: %s", attempt + 1, e)
                 
                 if attempt == max_retries - 1:
                     raise e
@@ -355,6 +590,34 @@ CRITICAL: Use only cocktail names from the provided collection. Be confident and
         
         raise Exception("All API attempts exhausted")
     
+    def _invoke_model(self, body: bytes) -> Dict[str, Any]:
+        """Invoke the model, dropping latency-optimized mode if Bedrock rejects it"""
+        # Only reached with a live client, so botocore is already loaded by setup_aws
+        from botocore.exceptions import ClientError, ParamValidationError
+        
+        if self.latency_mode == 'standard':
+            return invoke_model_json(self.bedrock_client, self.model_id, body)
+        
+        try:
+            return invoke_model_json(self.bedrock_client, self.model_id, body,
+                                     performanceConfigLatency=self.latency_mode)
+        except (ClientError, ParamValidationError) as e:
+            # ParamValidationError: botocore predates performanceConfigLatency.
+            # ClientError: Bedrock rejected it for this model/region. Any other
+            # failure (including unrelated validation errors) is re-raised as is.
+            if isinstance(e, ClientError):
+                error = e.response.get('Error', {})
+                unsupported = (error.get('Code') == 'ValidationException'
+                               and 'latency' in error.get('Message', '').lower())
+            else:
+                unsupported = 'performanceConfigLatency' in str(e)
+            if not unsupported:
+                raise
+        
+        logger.info("Latency-optimized inference unavailable for %s, using standard", self.model_id)
+        self.latency_mode = 'standard'
+        return invoke_model_json(self.bedrock_client, self.model_id, body)
+    
     def _parse_ai_response_advanced(self, ai_text: str) -> Dict[str, Any]:
         """Advanced AI response parsing with multiple strategies"""
         
@@ -368,41 +631,15 @@ CRITICAL: Use only cocktail names from the provided collection. Be confident and
     
     def _extract_clean_json(self, text: str) -> Optional[Dict[str, Any]]:
         """Extract JSON with comprehensive cleaning"""
-        
-        # Clean text
-        cleaned = text.strip()
-        
-        # Remove various markdown formats
-        for marker in ['```json', '```JSON', '```', '`']:
-            if cleaned.startswith(marker):
-                cleaned = cleaned[len(marker):]
-            if cleaned.endswith(marker):
-                cleaned = cleaned[:-len(marker)]
-        
-        cleaned = cleaned.strip()
-        
-        # Try direct parsing
-        try:
-            return json.loads(cleaned)
-        except json.JSONDecodeError:
-            pass
-        
-        # Find JSON objects in text
-        json_patterns = [
-            r'\\{[^{}]*"cocktail_name"[^{}]*\\}',  # JSON with cocktail_name
-            r'\\{.*?"cocktail_name".*?\\}',       # Any JSON with cocktail_name
-            r'\\{[^{}]+\\}',                       # Simple JSON object
-        ]
-        
-        for pattern in json_patterns:
-            matches = re.findall(pattern, text, re.DOTALL | re.IGNORECASE)
-            for match in matches:
-                try:
-                    return json.loads(match)
-                except json.JSONDecodeError:
-                    continue
-        
-        return None
+        parsed = _parse_claude_json(text, '{')
+        return parsed if isinstance(parsed, dict) else None
+    
+    def _extract_json_array(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        """Extract a JSON array of result objects from a batched response"""
+        return _parse_claude_json(
+            text, '[',
+            accept=lambda value: isinstance(value, list) and all(isinstance(item, dict) for item in value)
+        )
     
     def _extract_with_regex_advanced(self, text: str) -> Dict[str, Any]:
         """Advanced regex extraction with intelligent parsing"""
@@ -432,7 +669,7 @@ CRITICAL: Use only cocktail names from the provided collection. Be confident and
             'cocktail_name': cocktail_name,
             'confidence_score': confidence,
             'primary_explanation': explanation,
-            'detailed_analysis': text[:300] + "...",
+            'detailed_analysis': truncate(text, 300),
             'flavor_harmony': 'Complementary flavor profiles',
             'cultural_connection': 'Thematic and aesthetic alignment',
             'alternatives': [name for name in self.cocktails.keys() if name != cocktail_name][:2],
@@ -443,45 +680,60 @@ CRITICAL: Use only cocktail names from the provided collection. Be confident and
         """Find cocktail name in text with fuzzy matching"""
         text_lower = text.lower()
         
+        # Exact name (e.g. "Old Fashioned" or "old_fashioned")
+        exact = self._cocktail_name_lookup.get(text_lower.strip())
+        if exact:
+            return exact
+        
         # Direct name matching
-        for cocktail_name, details in self.cocktails.items():
-            if cocktail_name in text_lower or details['name'].lower() in text_lower:
+        for cocktail_name, terms in self._cocktail_match_terms:
+            if any(term in text_lower for term in terms):
                 return cocktail_name
         
         # Partial matching
-        for cocktail_name, details in self.cocktails.items():
-            for word in cocktail_name.split('_'):
-                if len(word) > 3 and word in text_lower:
-                    return cocktail_name
+        for cocktail_name, words in self._cocktail_partial_terms:
+            if any(word in text_lower for word in words):
+                return cocktail_name
         
         return 'martini'  # Sophisticated default
     
+    def _resolve_cocktail_key(self, name: Any) -> Optional[str]:
+        """Map a cocktail name from Claude to a collection key, memoized per name"""
+        if not isinstance(name, str):
+            return None
+        try:
+            return self._cocktail_key_cache[name]
+        except KeyError:
+            pass
+        
+        normalized = name.strip().lower()
+        key = self._cocktail_name_lookup.get(normalized) or self._cocktail_name_lookup.get(normalized.replace(' ', '_'))
+        if len(self._cocktail_key_cache) < 512:
+            self._cocktail_key_cache[name] = key
+        return key
+    
     def _validate_and_enhance_response(self, response: Dict[str, Any], movie_context: Dict[str, str]) -> Dict[str, Any]:
         """Validate and enhance the AI response"""
         
         # Ensure valid cocktail
-        cocktail_name = response.get('cocktail_name', 'martini')
-        if cocktail_name not in self.cocktails:
+        cocktail_name = self._resolve_cocktail_key(response.get('cocktail_name', 'martini'))
+        if cocktail_name is None:
             cocktail_name = self._find_cocktail_in_text(str(response))
         
         cocktail_details = self.cocktails[cocktail_name]
         
-        # Ensure valid alternatives
+        # Ensure valid, distinct alternatives (dict keeps first-seen order)
         alternatives = response.get('alternatives', [])
-        valid_alternatives = []
-        for alt in alternatives:
-            if isinstance(alt, str):
-                alt_clean = alt.lower().replace(' ', '_')
-                if alt_clean in self.cocktails and alt_clean != cocktail_name:
-                    valid_alternatives.append(alt_clean)
-        
-        # Fill alternatives if needed
-        while len(valid_alternatives) < 2:
-            for name in self.cocktails.keys():
-                if name != cocktail_name and name not in valid_alternatives:
-                    valid_alternatives.append(name)
-                    break
-            break
+        if not isinstance(alternatives, list):
+            alternatives = []
+        valid_alternatives = dict.fromkeys(
+            key for key in map(self._resolve_cocktail_key, alternatives)
+            if key and key != cocktail_name
+        )
+        
+        # Fill alternatives if needed, stopping as soon as there are two
+        fillers = (name for name in self.cocktails if name != cocktail_name and name not in valid_alternatives)
+        valid_alternatives = list(islice(chain(valid_alternatives, fillers), 2))
         
         return {
             'success': True,
@@ -566,6 +818,7 @@ CRITICAL: Use only cocktail names from the provided collection. Be confident and
             'successful_api_calls': self.successful_calls,
             'success_rate_percent': round(success_rate, 2),
             'aws_connected': self.bedrock_client is not None,
+            'cached_recommendations': len(self._recommendation_cache),
             'model_id': getattr(self, 'model_id', 'N/A')
         }
     
@@ -574,12 +827,23 @@ CRITICAL: Use only cocktail names from the provided collection. Be confident and
         return asyncio.run(self.get_recommendation(movie_title))
 
 
+_agent: Optional[ProductionLLMAgent] = None
+
+
+def get_agent() -> ProductionLLMAgent:
+    """Return the shared agent, building it (and its Bedrock client) on first use"""
+    global _agent
+    if _agent is None:
+        _agent = ProductionLLMAgent()
+    return _agent
+
+
 async def run_comprehensive_test():
     """Comprehensive test of the production system"""
     print("🚀 Production LLM System - Comprehensive Test")
     print("=" * 70)
     
-    agent = ProductionLLMAgent()
+    agent = get_agent()
     
     test_cases = [
         "Casablanca",
@@ -593,12 +857,12 @@ async def run_comprehensive_test():
     
     print(f"\\n🧪 Testing {len(test_cases)} movies...")
     
-    for i, movie in enumerate(test_cases, 1):
+    results = await agent.get_recommendations(test_cases)
+    
+    for i, (movie, result) in enumerate(zip(test_cases, results), 1):
         print(f"\\n[{i}/{len(test_cases)}] 🎬 {movie}")
         print("-" * 50)
         
-        result = await agent.get_recommendation(movie)
-        
         if result['success']:
             rec = result['recommendation']
             cocktail = result['cocktail']
@@ -640,7 +904,7 @@ def interactive_production_test():
     print("Type 'quit' to exit")
     print("-" * 50)
     
-    agent = ProductionLLMAgent()
+    agent = get_agent()
     
     while True:
         user_input = input("\\nEnter movie title: ").strip()
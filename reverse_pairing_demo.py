@@ -5,16 +5,20 @@ AI agent that recommends movies based on alcohol preferences
 """
 
 import asyncio
-import sys
 import os
 from typing import Dict, Optional, List
 import json
+import logging
+import re
 import boto3
 from dotenv import load_dotenv
+from src.utils.llm_helpers import invoke_model_json, truncate
 
 # Load environment
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 class ReversePairingAgent:
     """AI agent that recommends movies based on alcohol preferences"""
     
@@ -138,6 +142,12 @@ class ReversePairingAgent:
         
         # Combine all alcohol types
         self.all_alcohol = {**self.cocktails, **self.beers, **self.wines}
+        
+        # Lowercased keys and names for partial matching in find_alcohol
+        self._alcohol_search_terms = tuple(
+            (key.lower(), alcohol['name'].lower(), alcohol)
+            for key, alcohol in self.all_alcohol.items()
+        )
         print(f"✅ Loaded {len(self.all_alcohol)} alcoholic beverages")
         
     def load_movie_database(self):
@@ -215,6 +225,17 @@ class ReversePairingAgent:
                 'themes': ['love', 'kindness', 'imagination']
             }
         }
+        
+        # Normalized titles for partial matching in find_movie
+        self._movie_title_keys = tuple(
+            (movie['title'].lower().replace(' ', '_'), movie)
+            for movie in self.movies.values()
+        )
+        
+        # Whole-word alternation of all titles for scanning AI text in one pass
+        self._titles_by_lower = {movie['title'].lower(): movie['title'] for movie in self.movies.values()}
+        titles = sorted(self._titles_by_lower, key=len, reverse=True)
+        self._title_pattern = re.compile(r'\b(?:' + '|'.join(map(re.escape, titles)) + r')\b')
         print(f"✅ Loaded {len(self.movies)} movies for recommendations")
     
     async def recommend_movies_for_alcohol(self, alcohol_name: str) -> Dict:
@@ -274,10 +295,10 @@ class ReversePairingAgent:
             return self.all_alcohol[alcohol_lower]
         
         # Partial match search
-        for name, alcohol in self.all_alcohol.items():
-            if (alcohol_lower in name.lower() or 
-                name.lower() in alcohol_lower or
-                alcohol_lower in alcohol['name'].lower()):
+        for key_lower, name_lower, alcohol in self._alcohol_search_terms:
+            if (alcohol_lower in key_lower or 
+                key_lower in alcohol_lower or
+                alcohol_lower in name_lower):
                 return alcohol
         
         return None
@@ -291,9 +312,8 @@ class ReversePairingAgent:
             return self.movies[movie_lower]
         
         # Search by title
-        for key, movie in self.movies.items():
-            if (movie_lower in movie['title'].lower().replace(' ', '_') or
-                movie['title'].lower().replace(' ', '_') in movie_lower):
+        for title_key, movie in self._movie_title_keys:
+            if movie_lower in title_key or title_key in movie_lower:
                 return movie
         
         return None
@@ -352,14 +372,10 @@ Focus on meaningful connections between the drink's character and the films' atm
                 "temperature": 0.7
             })
             
-            response = self.bedrock_client.invoke_model(
-                modelId=self.model_id,
-                body=body,
-                contentType='application/json'
+            # Run the blocking boto3 call off the event loop
+            result = await asyncio.to_thread(
+                invoke_model_json, self.bedrock_client, self.model_id, body
             )
-            
-            # Parse response
-            result = json.loads(response['body'].read())
             ai_text = result['content'][0]['text']
             
             # Try to parse JSON response
@@ -378,23 +394,23 @@ Focus on meaningful connections between the drink's character and the films' atm
                 # If JSON parsing fails, extract info manually
                 return {
                     "movie_recommendations": self.extract_movies_from_text(ai_text),
-                    "explanation": ai_text[:300] + "...",
+                    "explanation": truncate(ai_text, 300),
                     "mood_analysis": "AI provided detailed analysis",
                     "confidence": "Medium",
                     "reasoning": "AI analysis with manual parsing"
                 }
                 
         except Exception as e:
-            print(f"AI recommendation failed: {str(e)}")
+            logger.warning("AI recommendation failed: %s", e)
             return self.get_intelligent_fallback_movies(alcohol)
     
     def extract_movies_from_text(self, text: str) -> List[str]:
         """Extract movie titles from AI text response"""
-        # Look for movie titles that match our database
-        found_movies = []
-        for movie in self.movies.values():
-            if movie['title'].lower() in text.lower():
-                found_movies.append(movie['title'])
+        # Look for movie titles that match our database, in order of mention
+        found_movies = list(dict.fromkeys(
+            self._titles_by_lower[match.group(0)]
+            for match in self._title_pattern.finditer(text.lower())
+        ))
         
         if found_movies:
             return found_movies[:3]
@@ -404,9 +420,8 @@ Focus on meaningful connections between the drink's character and the films' atm
     
     def get_intelligent_fallback_movies(self, alcohol: Dict) -> Dict:
         """Intelligent rule-based movie recommendations when AI fails"""
-        name = alcohol['name'].lower()
         alcohol_type = alcohol['type']
-        tags = [tag.lower() for tag in alcohol.get('tags', [])]
+        tags = {tag.lower() for tag in alcohol.get('tags', ())}
         
         # Rule-based movie matching
         if 'sophisticated' in tags or 'elegant' in tags:
@@ -467,12 +482,15 @@ async def run_reverse_demo():
         "Cabernet Sauvignon"
     ]
     
-    for alcohol in test_alcohols:
+    # Fire all recommendations together and print them in input order
+    results = await asyncio.gather(
+        *(agent.recommend_movies_for_alcohol(alcohol) for alcohol in test_alcohols)
+    )
+    
+    for alcohol, result in zip(test_alcohols, results):
         print(f"\n🍸 Alcohol: {alcohol}")
         print("-" * 40)
         
-        result = await agent.recommend_movies_for_alcohol(alcohol)
-        
         if result['success']:
             print(f"🥃 Type: {result['alcohol']['type']}")
             print(f"👅 Flavor: {result['alcohol']['flavor_profile']}")
@@ -3,7 +3,7 @@ Base Agent class for AWS Strands solution
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, MutableMapping, Optional
 from pydantic import BaseModel
 import logging
 
@@ -31,9 +31,13 @@ class BaseAgent(ABC):
 
     @abstractmethod
     async def execute(
-        self, task: str, context: Optional[Dict[str, Any]] = None
+        self, task: str, context: Optional[MutableMapping[str, Any]] = None
     ) -> Dict[str, Any]:
-        """Execute a task with the given context"""
+        """Execute a task with the given context
+
+        Inside a workflow the context is a ChainMap layering earlier step
+        results over the caller's context.
+        """
         pass
 
     @abstractmethod
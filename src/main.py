@@ -4,14 +4,14 @@ Main application entry point
 
 import asyncio
 import logging
-from src.utils.config import Config
+from src.utils.config import AWS_REGION, BEDROCK_MODEL_ID, LOG_LEVEL, Config
 from src.agents.base_agent import BaseAgent, AgentConfig
 from src.tools.aws_tools import AWSBedrockTool, AWSS3Tool
 from src.workflows.orchestrator import Workflow, WorkflowStep
 
 # Configure logging
 logging.basicConfig(
-    level=getattr(logging, Config.LOG_LEVEL),
+    level=getattr(logging, LOG_LEVEL),
     format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
 )
 logger = logging.getLogger(__name__)
@@ -53,13 +53,13 @@ async def main():
         agent_config = AgentConfig(
             name="sample_agent",
             description="A sample agent for demonstration",
-            model_id=Config.BEDROCK_MODEL_ID,
+            model_id=BEDROCK_MODEL_ID,
         )
         agent = SampleAgent(agent_config)
 
         # Add tools to agent
-        bedrock_tool = AWSBedrockTool(Config.AWS_REGION)
-        s3_tool = AWSS3Tool(Config.AWS_REGION)
+        bedrock_tool = AWSBedrockTool(AWS_REGION)
+        s3_tool = AWSS3Tool(AWS_REGION)
         agent.add_tool(bedrock_tool)
         agent.add_tool(s3_tool)
 
@@ -1,10 +1,38 @@
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Literal, Optional
 from pydantic import BaseModel
 import http
+import logging
 import requests
 import os
 from dotenv import load_dotenv
 
+logger = logging.getLogger(__name__)
+
+OMDB_BASE_URL = "http://www.omdbapi.com/"
+
+# Shared across searches so repeat lookups reuse pooled keep-alive connections
+_session = requests.Session()
+
+# Bounded LRU of found movies keyed by normalized search parameters
+MOVIE_CACHE_SIZE = 256
+_movie_cache: "OrderedDict[tuple, Movie]" = OrderedDict()
+
+
+@lru_cache(maxsize=1)
+def _load_env_once() -> None:
+    load_dotenv()
+
+
+def get_omdb_api_key() -> Optional[str]:
+    # A key already in the environment skips the .env file probe entirely
+    api_key = os.getenv("OMDB_API_KEY")
+    if api_key:
+        return api_key
+    _load_env_once()
+    return os.getenv("OMDB_API_KEY")
+
 
 class Movie(BaseModel):
     title: str
@@ -53,32 +81,41 @@ class MovieSearch:
         self.title = title
         self.year = year
 
-    def __get_search_url(self, api_key: str) -> str:
-        base_url = "http://www.omdbapi.com/"
+    def __get_search_params(self, api_key: str) -> dict:
+        return {
+            "t": self.title,
+            "type": self.type,
+            "y": self.year if self.year else "",
+            "plot": self.plot,
+            "apikey": api_key,
+        }
 
-        return "%s?t=%s&type=%s&y=%s&plot=%s&apikey=%s" % (
-            base_url,
-            self.title,
-            self.type,
-            self.year if self.year else "",
-            self.plot,
-            api_key,
-        )
+    def __cache_key(self) -> tuple:
+        return (self.title.strip().lower(), self.year, self.type, self.plot)
+
+    def invalidate(self) -> None:
+        """Drop any cached result for this search."""
+        _movie_cache.pop(self.__cache_key(), None)
 
     def search_movie(self) -> Optional[Movie]:
-        load_dotenv()
-        API_KEY = os.getenv("OMDB_API_KEY")
+        cache_key = self.__cache_key()
+        cached = _movie_cache.get(cache_key)
+        if cached is not None:
+            _movie_cache.move_to_end(cache_key)
+            return cached
+
+        API_KEY = get_omdb_api_key()
         if not API_KEY:
             raise ValueError("OMDB_API_KEY not found in environment variables.")
 
-        url = self.__get_search_url(API_KEY)
+        params = self.__get_search_params(API_KEY)
 
-        print("Searching for movie...")
-        response = requests.get(url, timeout=10)
+        logger.debug("Searching OMDB for %s", self.title)
+        response = _session.get(OMDB_BASE_URL, params=params, timeout=10)
         if response.status_code == http.HTTPStatus.OK:
             data = response.json()
             if data.get("Response") == "False":
-                print("Error: Movie not found.")
+                logger.info("Movie not found: %s", self.title)
                 return None
 
             movie = Movie(
@@ -96,6 +133,11 @@ class MovieSearch:
                 country=data.get("Country", ""),
                 imdb_rating=data.get("imdbRating", ""),
             )
+            _movie_cache[cache_key] = movie
+            if len(_movie_cache) > MOVIE_CACHE_SIZE:
+                _movie_cache.popitem(last=False)
             return movie
         else:
-            print("Error fetching data from API.")
+            logger.warning(
+                "Error fetching data from OMDB API: HTTP %s", response.status_code
+            )
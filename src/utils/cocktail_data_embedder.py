@@ -1,9 +1,16 @@
 import os
 import json
+import orjson
 import psycopg2
+from psycopg2.extras import execute_batch
 
-COCKTAILS_DIR = "data//cocktails//data//cocktails/"
-INGREDIENTS_DIR = "data/cocktails/data/ingredients/"
+# Defaults resolve against the repository root rather than the working directory
+DATA_ROOT = os.getenv(
+    "COCKTAILS_DATA_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "data", "cocktails"),
+)
+COCKTAILS_DIR = os.path.join(DATA_ROOT, "data", "cocktails")
+INGREDIENTS_DIR = os.path.join(DATA_ROOT, "data", "ingredients")
 
 
 def get_all_data_json_paths(root_dir):
@@ -17,29 +24,45 @@ def get_all_data_json_paths(root_dir):
     return paths
 
 
-def insert_cocktail(cur, cocktail):
-    cur.execute(
-        """
-        INSERT INTO cocktails (
-            id, name, instructions, created_at, updated_at, description, source, garnish, abv, glass, method, year
-        ) VALUES (
-            %(id)s, %(name)s, %(instructions)s, %(created_at)s, %(updated_at)s, %(description)s, %(source)s, %(garnish)s, %(abv)s, %(glass)s, %(method)s, %(year)s
-        ) ON CONFLICT DO NOTHING;
-    """,
-        {
-            "id": cocktail.get("_id"),
-            "name": cocktail.get("name"),
-            "instructions": cocktail.get("instructions"),
-            "created_at": cocktail.get("created_at"),
-            "updated_at": cocktail.get("updated_at"),
-            "description": cocktail.get("description"),
-            "source": cocktail.get("source"),
-            "garnish": cocktail.get("garnish"),
-            "abv": cocktail.get("abv"),
-            "glass": cocktail.get("glass"),
-            "method": cocktail.get("method"),
-            "year": cocktail.get("year"),
-        },
+def load_json_file(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    return orjson.loads(data)
+
+
+INSERT_COCKTAIL_SQL = """
+    INSERT INTO cocktails (
+        id, name, instructions, created_at, updated_at, description, source, garnish, abv, glass, method, year
+    ) VALUES (
+        %(id)s, %(name)s, %(instructions)s, %(created_at)s, %(updated_at)s, %(description)s, %(source)s, %(garnish)s, %(abv)s, %(glass)s, %(method)s, %(year)s
+    ) ON CONFLICT DO NOTHING;
+"""
+
+
+def cocktail_params(cocktail):
+    return {
+        "id": cocktail.get("_id"),
+        "name": cocktail.get("name"),
+        "instructions": cocktail.get("instructions"),
+        "created_at": cocktail.get("created_at"),
+        "updated_at": cocktail.get("updated_at"),
+        "description": cocktail.get("description"),
+        "source": cocktail.get("source"),
+        "garnish": cocktail.get("garnish"),
+        "abv": cocktail.get("abv"),
+        "glass": cocktail.get("glass"),
+        "method": cocktail.get("method"),
+        "year": cocktail.get("year"),
+    }
+
+
+def insert_cocktails(cur, cocktails, page_size=100):
+    # One round-trip per page instead of one per cocktail
+    execute_batch(
+        cur,
+        INSERT_COCKTAIL_SQL,
+        [cocktail_params(cocktail) for cocktail in cocktails],
+        page_size=page_size,
     )
 
 
@@ -86,15 +109,16 @@ def main():
     )
     cur = conn.cursor()
 
+    cocktails = []
     for path in get_all_data_json_paths(COCKTAILS_DIR):
         try:
-            with open(path, 'r', encoding='utf-8') as f:
-                cocktail = json.load(f)
-                insert_cocktail(cur, cocktail)
+            cocktails.append(load_json_file(path))
         except (json.JSONDecodeError, FileNotFoundError, IOError, UnicodeDecodeError) as e:
             print(f"Error loading cocktail file {path}: {e}")
             continue
 
+    insert_cocktails(cur, cocktails)
+
     # for path in get_all_data_json_paths(INGREDIENTS_DIR):
     #     try:
     #         with open(path, 'r', encoding='utf-8') as f:
@@ -16,14 +16,21 @@ Features:
 import json
 import csv
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any
 import logging
+import orjson
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Defaults resolve against the repository root so the script runs from any checkout
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_DATA_DIR = REPO_ROOT / "data" / "cocktails"
+DEFAULT_OUTPUT_DIR = REPO_ROOT / "data" / "output"
+
 
 class CocktailCSVConverter:
     def __init__(self, data_dir: str, output_dir: str):
@@ -128,8 +135,7 @@ class CocktailCSVConverter:
             Dictionary with processed cocktail data
         """
         try:
-            with open(cocktail_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = orjson.loads(cocktail_path.read_bytes())
             
             # Extract ingredients text
             ingredients = data.get('ingredients', [])
@@ -213,12 +219,27 @@ class CocktailCSVConverter:
         
         logger.info(f"Created metadata sidecar: {metadata_path}")
 
-    def convert_to_csv(self, output_filename: str = "cocktails.csv"):
+    def find_cocktail_files(self) -> List[Path]:
+        """Collect each cocktail's data.json path in a single directory scan."""
+        data_files = []
+        with os.scandir(self.cocktails_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                data_file = Path(entry.path) / "data.json"
+                if data_file.exists():
+                    data_files.append(data_file)
+                else:
+                    logger.warning(f"No data.json found in {entry.path}")
+        return data_files
+
+    def convert_to_csv(self, output_filename: str = "cocktails.csv", max_workers: int = 16):
         """
         Convert all cocktail JSON files to a single CSV.
         
         Args:
             output_filename: Name of the output CSV file
+            max_workers: Number of threads used to read cocktail files
         """
         if not self.cocktails_dir.exists():
             raise FileNotFoundError(f"Cocktails directory not found: {self.cocktails_dir}")
@@ -227,19 +248,16 @@ class CocktailCSVConverter:
         processed_count = 0
         error_count = 0
         
-        # Process all cocktail directories
-        for cocktail_dir in self.cocktails_dir.iterdir():
-            if cocktail_dir.is_dir():
-                data_file = cocktail_dir / "data.json"
-                if data_file.exists():
-                    row_data = self.process_cocktail_file(data_file)
-                    if row_data:
-                        cocktail_data.append(row_data)
-                        processed_count += 1
-                    else:
-                        error_count += 1
+        # Read the many small cocktail files concurrently; rows are collected
+        # here in the calling thread, in directory order
+        data_files = self.find_cocktail_files()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for row_data in executor.map(self.process_cocktail_file, data_files):
+                if row_data:
+                    cocktail_data.append(row_data)
+                    processed_count += 1
                 else:
-                    logger.warning(f"No data.json found in {cocktail_dir}")
+                    error_count += 1
         
         if not cocktail_data:
             raise ValueError("No cocktail data found to convert")
@@ -270,9 +288,9 @@ class CocktailCSVConverter:
 
 def main():
     """Main function to run the conversion."""
-    # Configuration
-    data_dir = r"C:\Users\vedti\Downloads\BoNUS\data\cocktails"
-    output_dir = r"C:\Users\vedti\Downloads\BoNUS\data\output"
+    # Configuration (override with COCKTAILS_DATA_DIR / COCKTAILS_OUTPUT_DIR)
+    data_dir = os.getenv("COCKTAILS_DATA_DIR", str(DEFAULT_DATA_DIR))
+    output_dir = os.getenv("COCKTAILS_OUTPUT_DIR", str(DEFAULT_OUTPUT_DIR))
     
     try:
         # Create converter and run conversion
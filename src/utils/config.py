@@ -64,3 +64,10 @@ class Config:
             )
 
         return True
+
+
+# Module-level snapshots of settings that never change after import, for
+# callers that read them often: ``from src.utils.config import AWS_REGION``
+AWS_REGION = Config.AWS_REGION
+BEDROCK_MODEL_ID = Config.BEDROCK_MODEL_ID
+LOG_LEVEL = Config.LOG_LEVEL
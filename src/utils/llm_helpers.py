@@ -0,0 +1,33 @@
+"""
+Helpers shared by the Bedrock-backed recommendation scripts
+"""
+
+from typing import Any, Dict
+
+import orjson
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Serialize a request payload to bytes (Bedrock accepts bytes bodies)"""
+    return orjson.dumps(obj)
+
+
+def json_loads(data):
+    """Parse JSON from bytes or str; orjson's error subclasses json.JSONDecodeError"""
+    return orjson.loads(data)
+
+
+def truncate(text: str, limit: int) -> str:
+    """Cut text to limit characters, adding '...' only when it was cut"""
+    return text if len(text) <= limit else text[:limit] + "..."
+
+
+def invoke_model_json(client, model_id: str, body, **kwargs) -> Dict[str, Any]:
+    """Blocking Bedrock call: send the request and parse the response body
+
+    Extra keyword arguments are passed through to ``invoke_model``.
+    """
+    response = client.invoke_model(
+        modelId=model_id, body=body, contentType="application/json", **kwargs
+    )
+    return json_loads(response["body"].read())
@@ -5,17 +5,32 @@ Simple CSV verification script to check the output format
 
 import csv
 import json
+import os
+from pathlib import Path
+
+DEFAULT_OUTPUT_DIR = Path(__file__).resolve().parents[2] / "data" / "output"
 
 def check_csv_output():
-    csv_path = r"C:\Users\vedti\Downloads\BoNUS\data\output\cocktails_knowledge_base.csv"
+    output_dir = os.getenv("COCKTAILS_OUTPUT_DIR", str(DEFAULT_OUTPUT_DIR))
+    csv_path = os.path.join(output_dir, "cocktails_knowledge_base.csv")
     
     print("🔍 Checking CSV output...")
     
+    if not os.path.isfile(csv_path):
+        print(f"❌ CSV file not found: {csv_path}")
+        return
+    
     with open(csv_path, 'r', encoding='utf-8') as f:
         reader = csv.DictReader(f)
         
-        rows = list(reader)
-        total_rows = len(rows)
+        # Stream the rows once: count them and keep only the samples we show
+        sample_names = ['Margarita', 'Negroni', 'Martini']
+        samples = {}
+        total_rows = 0
+        for row in reader:
+            total_rows += 1
+            if row['name'] in sample_names:
+                samples.setdefault(row['name'], row)
         
         print(f"📊 Total cocktails: {total_rows}")
         print(f"📋 Columns: {len(reader.fieldnames)}")
@@ -24,10 +39,9 @@ def check_csv_output():
         # Check a few sample rows
         print("\n🍸 Sample cocktails:")
         
-        for i, sample_name in enumerate(['Margarita', 'Negroni', 'Martini']):
-            matching_rows = [row for row in rows if row['name'] == sample_name]
-            if matching_rows:
-                row = matching_rows[0]
+        for i, sample_name in enumerate(sample_names):
+            row = samples.get(sample_name)
+            if row:
                 print(f"\n{i+1}. {row['name']}")
                 print(f"   🆔 ID: {row['cocktail_id']}")
                 print(f"   🥃 Glass: {row['glass']}")
@@ -39,7 +53,6 @@ def check_csv_output():
                 print(f"   📖 Description: {row['description'][:80]}...")
         
         # Check file size
-        import os
         file_size = os.path.getsize(csv_path) / (1024 * 1024)
         print(f"\n📦 File size: {file_size:.2f} MB")
         
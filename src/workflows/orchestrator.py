@@ -2,8 +2,10 @@
 Workflow orchestration for agent interactions
 """
 
-# import asyncio
-from typing import List, Dict, Any, Optional
+import asyncio
+from collections import ChainMap
+from graphlib import TopologicalSorter
+from typing import List, Dict, Any, MutableMapping, Optional
 from src.agents.base_agent import BaseAgent
 import logging
 
@@ -12,17 +14,24 @@ logger = logging.getLogger(__name__)
 
 
 class WorkflowStep:
-    """Represents a single step in a workflow"""
+    """Represents a single step in a workflow
+
+    ``dependencies`` lists the ids of steps whose results this step needs.
+    Leaving it as None makes the step depend on the step added before it;
+    pass an empty list for a step that can run as soon as the workflow starts.
+    """
 
     def __init__(
         self,
         agent: BaseAgent,
         task: str,
         dependencies: Optional[List[str]] = None,
+        step_id: Optional[str] = None,
     ):
         self.agent = agent
         self.task = task
-        self.dependencies = dependencies or []
+        self.dependencies = dependencies
+        self.step_id = step_id
         self.result = None
         self.completed = False
 
@@ -38,8 +47,44 @@ class Workflow:
 
     def add_step(self, step: WorkflowStep):
         """Add a step to the workflow"""
+        if step.step_id is None:
+            step.step_id = f"step_{len(self.steps) + 1}"
+        if step.dependencies is None:
+            step.dependencies = [self.steps[-1].step_id] if self.steps else []
         self.steps.append(step)
 
+    def _build_schedule(self) -> TopologicalSorter:
+        """Validate step dependencies and return a prepared sorter"""
+        steps_by_id = {step.step_id: step for step in self.steps}
+        if len(steps_by_id) != len(self.steps):
+            raise ValueError("Workflow step ids must be unique")
+
+        graph = {}
+        for step in self.steps:
+            unknown = [dep for dep in step.dependencies if dep not in steps_by_id]
+            if unknown:
+                raise ValueError(
+                    f"Step {step.step_id} depends on unknown steps: {unknown}"
+                )
+            graph[step.step_id] = step.dependencies
+
+        sorter = TopologicalSorter(graph)
+        sorter.prepare()  # raises graphlib.CycleError on circular dependencies
+        return sorter
+
+    async def _run_step(
+        self, step: WorkflowStep, step_context: MutableMapping[str, Any]
+    ) -> Any:
+        """Execute one step and record its result"""
+        logger.info(f"Executing {step.step_id}: {step.task}")
+
+        result = await step.agent.execute(step.task, step_context)
+        step.result = result
+        step.completed = True
+
+        logger.info(f"{step.step_id} completed successfully")
+        return result
+
     async def execute(
         self, context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
@@ -47,23 +92,36 @@ class Workflow:
         logger.info(f"Starting workflow: {self.name}")
 
         try:
-            # Simple sequential execution for now
-            for i, step in enumerate(self.steps):
-                logger.info(f"Executing step {i+1}: {step.task}")
-
-                # Add results from previous steps to context
-                step_context = context.copy() if context else {}
-                step_context.update(self.results)
-
-                # Execute the step
-                result = await step.agent.execute(step.task, step_context)
-                step.result = result
-                step.completed = True
-
-                # Store result with step identifier
-                self.results[f"step_{i+1}"] = result
-
-                logger.info(f"Step {i+1} completed successfully")
+            sorter = self._build_schedule()
+            steps_by_id = {step.step_id: step for step in self.steps}
+            base_context = context or {}
+
+            # Run every step whose dependencies are satisfied concurrently,
+            # then release the steps that were waiting on them
+            while sorter.is_active():
+                ready = [steps_by_id[step_id] for step_id in sorter.get_ready()]
+
+                # Layer previous results over the caller's context without
+                # copying either; each step writes only to its own front dict
+                tasks = [
+                    asyncio.ensure_future(
+                        self._run_step(step, ChainMap({}, self.results, base_context))
+                    )
+                    for step in ready
+                ]
+                try:
+                    results = await asyncio.gather(*tasks)
+                except BaseException:
+                    # Don't leave sibling steps running after the workflow fails
+                    for task in tasks:
+                        task.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
+                    raise
+
+                # Store results with step identifiers
+                for step, result in zip(ready, results):
+                    self.results[step.step_id] = result
+                    sorter.done(step.step_id)
 
             logger.info(f"Workflow {self.name} completed successfully")
             return {
@@ -0,0 +1,43 @@
+"""
+Tests for parsing Claude replies in the improved LLM demo
+"""
+import pytest
+from improved_llm_demo import ImprovedLLMAgent
+
+
+@pytest.fixture
+def agent(monkeypatch):
+    """Agent with local data only; no Bedrock client is created"""
+    monkeypatch.setattr(
+        ImprovedLLMAgent, "setup_aws", lambda self: setattr(self, "bedrock_client", None)
+    )
+    return ImprovedLLMAgent()
+
+
+def test_json_array_skips_prose_brackets(agent):
+    """Brackets in the prose before the answer don't hide the JSON array"""
+    text = 'For [3] films: [{"cocktail_name": "negroni"}]'
+
+    assert agent.extract_json_array_from_text(text) == [{"cocktail_name": "negroni"}]
+
+
+def test_json_array_ignores_trailing_prose_brackets(agent):
+    """Brackets after the answer, or inside its strings, are not part of it"""
+    text = '[{"explanation": "bitter ]["}, {"cocktail_name": "martini"}] see [notes]'
+
+    assert agent.extract_json_array_from_text(text) == [
+        {"explanation": "bitter ]["},
+        {"cocktail_name": "martini"},
+    ]
+
+
+def test_json_array_missing(agent):
+    """Replies without an array of objects give None"""
+    assert agent.extract_json_array_from_text("No pairings [yet]") is None
+
+
+def test_json_object_skips_prose_braces(agent):
+    """Braces in the prose before the answer don't hide the JSON object"""
+    text = 'I think {this} fits. {"cocktail_name": "Negroni"}'
+
+    assert agent.extract_json_from_text(text) == {"cocktail_name": "Negroni"}
@@ -0,0 +1,153 @@
+"""
+Tests for workflow step scheduling
+"""
+import asyncio
+import pytest
+from src.agents.base_agent import AgentConfig, BaseAgent
+from src.workflows.orchestrator import Workflow, WorkflowStep
+
+
+class RecordingAgent(BaseAgent):
+    """Agent that records the context it saw and returns a fixed result"""
+
+    def __init__(self, name, result=None, on_execute=None):
+        super().__init__(AgentConfig(name=name, description=f"{name} test agent"))
+        self.result = result if result is not None else {"agent": name}
+        self.on_execute = on_execute
+        self.seen_context = None
+        self.calls = 0
+
+    async def execute(self, task, context=None):
+        self.calls += 1
+        self.seen_context = dict(context)
+        if self.on_execute:
+            await self.on_execute()
+        return self.result
+
+    def get_capabilities(self):
+        return ["record"]
+
+
+def test_steps_chain_to_previous_step_by_default():
+    """Steps added without dependencies depend on the step before them"""
+    workflow = Workflow("chain", "default chaining")
+    first = WorkflowStep(RecordingAgent("first"), "task one")
+    second = WorkflowStep(RecordingAgent("second"), "task two")
+    workflow.add_step(first)
+    workflow.add_step(second)
+
+    assert first.step_id == "step_1"
+    assert first.dependencies == []
+    assert second.step_id == "step_2"
+    assert second.dependencies == ["step_1"]
+
+
+@pytest.mark.asyncio
+async def test_results_visible_to_dependent_steps():
+    """Later steps see earlier results and the caller's context"""
+    first_agent = RecordingAgent("first", result={"movie": "Casablanca"})
+    second_agent = RecordingAgent("second")
+    workflow = Workflow("chain", "default chaining")
+    workflow.add_step(WorkflowStep(first_agent, "task one"))
+    workflow.add_step(WorkflowStep(second_agent, "task two"))
+
+    outcome = await workflow.execute({"user": "test"})
+
+    assert outcome["status"] == "success"
+    assert first_agent.seen_context == {"user": "test"}
+    assert second_agent.seen_context == {
+        "user": "test",
+        "step_1": {"movie": "Casablanca"},
+    }
+    assert outcome["results"] == {
+        "step_1": {"movie": "Casablanca"},
+        "step_2": {"agent": "second"},
+    }
+
+
+@pytest.mark.asyncio
+async def test_steps_without_dependencies_run_concurrently():
+    """Steps with empty dependency lists start together"""
+    started = {"a": asyncio.Event(), "b": asyncio.Event()}
+
+    def wait_for(own, other):
+        async def on_execute():
+            started[own].set()
+            # Only completes if the other step is running at the same time
+            await asyncio.wait_for(started[other].wait(), timeout=1)
+
+        return on_execute
+
+    workflow = Workflow("parallel", "independent steps")
+    workflow.add_step(
+        WorkflowStep(RecordingAgent("a", on_execute=wait_for("a", "b")), "a", [])
+    )
+    workflow.add_step(
+        WorkflowStep(RecordingAgent("b", on_execute=wait_for("b", "a")), "b", [])
+    )
+
+    outcome = await workflow.execute()
+
+    assert outcome["status"] == "success"
+    assert set(outcome["results"]) == {"step_1", "step_2"}
+
+
+@pytest.mark.asyncio
+async def test_unknown_dependency_is_reported():
+    """A dependency on a missing step fails before any agent runs"""
+    agent = RecordingAgent("orphan")
+    workflow = Workflow("broken", "unknown dependency")
+    workflow.add_step(WorkflowStep(agent, "task", ["missing"]))
+
+    outcome = await workflow.execute()
+
+    assert outcome["status"] == "error"
+    assert "unknown steps" in outcome["error"]
+    assert "missing" in outcome["error"]
+    assert agent.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_dependency_cycle_is_reported():
+    """Circular dependencies fail before any agent runs"""
+    first_agent = RecordingAgent("first")
+    second_agent = RecordingAgent("second")
+    workflow = Workflow("cycle", "circular dependencies")
+    workflow.add_step(WorkflowStep(first_agent, "one", ["second"], step_id="first"))
+    workflow.add_step(WorkflowStep(second_agent, "two", ["first"], step_id="second"))
+
+    outcome = await workflow.execute()
+
+    assert outcome["status"] == "error"
+    assert "cycle" in outcome["error"]
+    assert first_agent.calls == 0
+    assert second_agent.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_step_cancels_running_siblings():
+    """When one step fails, steps running alongside it are cancelled"""
+    sibling_cancelled = asyncio.Event()
+
+    async def fail():
+        raise RuntimeError("agent failed")
+
+    async def wait_forever():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            sibling_cancelled.set()
+            raise
+
+    workflow = Workflow("failing", "one step fails")
+    workflow.add_step(WorkflowStep(RecordingAgent("bad", on_execute=fail), "a", []))
+    workflow.add_step(
+        WorkflowStep(RecordingAgent("slow", on_execute=wait_forever), "b", [])
+    )
+
+    outcome = await asyncio.wait_for(workflow.execute(), timeout=5)
+
+    assert outcome["status"] == "error"
+    assert outcome["error"] == "agent failed"
+    assert sibling_cancelled.is_set()
+    assert outcome["partial_results"] == {}